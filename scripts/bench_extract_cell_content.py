@@ -0,0 +1,32 @@
+import glob
+import sys
+import time
+
+from parse import extract_cell_content, find_all_tables, make_soup
+
+def bench_extract_cell_content(pattern='input/*-transactions*.html', repeat=5):
+    """Time extract_cell_content over every cell of the matching exports."""
+    total_cells = 0
+    total_time = 0.0
+    print(f"{'File':<40} | {'Cells':>6} | {'Best (ms)':>9}")
+    print('-'*62)
+    for path in sorted(glob.glob(pattern)):
+        with open(path, encoding='utf-8') as f:
+            soup = make_soup(f.read())
+        cells = [cell for table in find_all_tables(soup) for cell in table.find_all(['td', 'th'])]
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for cell in cells:
+                extract_cell_content(cell)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        total_cells += len(cells)
+        total_time += best
+        print(f"{path:<40} | {len(cells):>6} | {best * 1000:>9.1f}")
+    if total_cells:
+        print(f"\n{total_cells} cells in {total_time * 1000:.1f} ms "
+              f"({total_cells / total_time:,.0f} cells/s)")
+
+if __name__ == '__main__':
+    bench_extract_cell_content(*sys.argv[1:2])
@@ -0,0 +1,126 @@
+import argparse
+import csv
+import json
+import os
+import shutil
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+from compile_league_stats import compile_league_stats
+from import_seasons import import_seasons
+from league_data import load_league
+from playoff_records import compile_league_stats as compile_playoff_stats
+from profiling import peak_rss_kb
+from synthetic_league import add_scale_arguments, generate_leagues, scale_options
+
+# A stage is flagged when it is this much slower than the baseline
+REGRESSION_THRESHOLD = 1.25
+
+def run_stage(results, name, func, rows=None):
+    start = time.perf_counter()
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        value = func()
+    elapsed = time.perf_counter() - start
+    count = rows(value) if rows else None
+    results[name] = {
+        'seconds': round(elapsed, 4),
+        'rows': count,
+        'rows_per_second': round(count / elapsed, 1) if count and elapsed else None,
+        'peak_rss_kb': peak_rss_kb(),
+    }
+    return value
+
+def csv_rows(csv_root):
+    """Data rows across every season CSV under csv_root."""
+    total = 0
+    for year in os.listdir(csv_root):
+        for name in os.listdir(os.path.join(csv_root, year)):
+            with open(os.path.join(csv_root, year, name), newline='', encoding='utf-8') as f:
+                total += sum(1 for _ in csv.reader(f)) - 1
+    return total
+
+def run_benchmark(work_root, options, workers=None):
+    """Generate synthetic leagues under work_root and time every pipeline stage over them."""
+    results = {}
+    roots = run_stage(results, 'generate', lambda: generate_leagues(work_root, **options))
+    html_bytes = sum(os.path.getsize(os.path.join(root, 'input', name))
+                     for root in roots for name in os.listdir(os.path.join(root, 'input')))
+    results['generate']['html_bytes'] = html_bytes
+
+    def parse():
+        for root in roots:
+            import_seasons(os.path.join(root, 'input'), os.path.join(root, 'csv'), workers=workers, manifest_path=None)
+    run_stage(results, 'parse', parse, rows=lambda _: sum(csv_rows(os.path.join(root, 'csv')) for root in roots))
+
+    leagues = run_stage(results, 'load', lambda: [
+        load_league(os.path.join(root, 'csv'), os.path.join(root, 'team_user_map.json')) for root in roots
+    ], rows=lambda leagues: sum(len(season.teams) + len(season.matchups) + len(season.transactions) + len(season.draft)
+                                for league in leagues for season in league.seasons.values()))
+
+    run_stage(results, 'records', lambda: [
+        compile_league_stats(output_csv=os.path.join(root, 'records.csv'), league=league)
+        for root, league in zip(roots, leagues)
+    ], rows=lambda _: sum(1 for league in leagues for _ in league.team_seasons()))
+
+    run_stage(results, 'playoffs', lambda: [compile_playoff_stats(league=league) for league in leagues],
+              rows=lambda _: sum(1 for league in leagues for _ in league.matchups()))
+    return results
+
+def compare(results, baseline):
+    print(f"{'Stage':<10} | {'Seconds':>9} | {'Baseline':>9} | {'Ratio':>6} | {'Rows/s':>12} | {'Peak RSS (MB)':>13}")
+    print('-'*75)
+    regressions = []
+    for stage, result in results.items():
+        base = baseline.get(stage, {}).get('seconds') if baseline else None
+        ratio = result['seconds'] / base if base else None
+        if ratio and ratio > REGRESSION_THRESHOLD and stage != 'generate':
+            regressions.append(stage)
+        rate = f"{result['rows_per_second']:,.0f}" if result['rows_per_second'] else '-'
+        rss = f"{result['peak_rss_kb'] / 1024:.1f}" if result['peak_rss_kb'] is not None else '-'
+        print(f"{stage:<10} | {result['seconds']:>9.3f} | {base if base else '-':>9} | "
+              f"{f'{ratio:.2f}' if ratio else '-':>6} | {rate:>12} | {rss:>13}")
+    if regressions:
+        print(f"\nSlower than {REGRESSION_THRESHOLD}x baseline: {', '.join(regressions)}")
+    return regressions
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the import and report pipeline on synthetic leagues.')
+    add_scale_arguments(parser)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--baseline', default='benchmarks/baseline.json')
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--output', help='write the results as JSON')
+    parser.add_argument('--keep', help='generate into this directory and keep it')
+    args = parser.parse_args()
+
+    options = scale_options(args)
+    work_root = args.keep or tempfile.mkdtemp(prefix='league-bench-')
+    try:
+        results = run_benchmark(work_root, options, args.workers)
+    finally:
+        if not args.keep:
+            shutil.rmtree(work_root, ignore_errors=True)
+
+    baseline = None
+    if os.path.isfile(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            stored = json.load(f)
+        # Timings are only comparable at the same scale
+        if stored.get('options') == options:
+            baseline = stored['results']
+        else:
+            print(f"Baseline {args.baseline} was recorded at a different scale, not comparing.")
+    print(f"Scale: {options}")
+    regressions = compare(results, baseline)
+
+    report = {'options': options, 'results': results}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=4)
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or '.', exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=4)
+        print(f"Baseline saved to {args.baseline}")
+    raise SystemExit(1 if regressions else 0)
@@ -0,0 +1,49 @@
+import csv
+import gzip
+import json
+import os
+import sys
+
+def read_table(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        fields = next(reader, [])
+        rows = [row for row in reader if any(cell.strip() for cell in row)]
+    return {'fields': fields, 'rows': rows}
+
+def build_site_data(csv_root='csv', output_root='data'):
+    """Write the file tree and every CSV table as static JSON for index.html.
+
+    manifest.json holds the directory tree, so the page can render the
+    sidebar in one request. bundle.json.gz holds every table pre-parsed
+    into fields and rows, so opening a table needs no further downloads.
+    """
+    tree = []
+    bundle = {}
+    for name in sorted(os.listdir(csv_root)):
+        path = os.path.join(csv_root, name)
+        if os.path.isdir(path):
+            files = []
+            for file_name in sorted(os.listdir(path)):
+                if file_name.endswith('.csv'):
+                    file_path = f'{csv_root}/{name}/{file_name}'
+                    bundle[file_path] = read_table(os.path.join(path, file_name))
+                    files.append({'name': file_name, 'path': file_path, 'rows': len(bundle[file_path]['rows'])})
+            tree.append({'name': name, 'type': 'dir', 'files': files})
+        elif name.endswith('.csv'):
+            file_path = f'{csv_root}/{name}'
+            bundle[file_path] = read_table(path)
+            tree.append({'name': name, 'type': 'file', 'path': file_path, 'rows': len(bundle[file_path]['rows'])})
+
+    os.makedirs(output_root, exist_ok=True)
+    bundle_json = json.dumps(bundle, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    # mtime=0 keeps the archive byte-identical when the tables have not changed
+    with open(os.path.join(output_root, 'bundle.json.gz'), 'wb') as f:
+        f.write(gzip.compress(bundle_json, mtime=0))
+    manifest = {'bundle': 'bundle.json.gz', 'tables': len(bundle), 'tree': tree}
+    with open(os.path.join(output_root, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=4)
+    print(f"Site data written to {output_root}/ ({len(bundle)} tables, {len(bundle_json):,} bytes uncompressed)")
+
+if __name__ == '__main__':
+    build_site_data(*sys.argv[1:3])
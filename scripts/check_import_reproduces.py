@@ -0,0 +1,57 @@
+import filecmp
+import os
+import shutil
+import sys
+import tempfile
+from contextlib import redirect_stdout
+
+from import_seasons import import_seasons, plan_imports, read_table, same_table
+from league_data import season_file
+
+def changed_files(left, right):
+    """Paths under two directory trees that differ or exist on one side only."""
+    compare = filecmp.dircmp(left, right)
+    changed = compare.left_only + compare.right_only + compare.diff_files
+    for name in compare.common_dirs:
+        changed += [os.path.join(name, path) for path in changed_files(os.path.join(left, name), os.path.join(right, name))]
+    return changed
+
+def check_import_reproduces(input_root='input', csv_root='csv'):
+    """Import every input page and check the result against the committed CSVs.
+
+    A fresh import must match each season table the page belongs to, cell for
+    cell once whitespace is normalised, under the file name the loaders read.
+    Importing over a copy of csv_root must then leave every file untouched.
+    """
+    problems = []
+    with tempfile.TemporaryDirectory() as tmp:
+        fresh_root = os.path.join(tmp, 'fresh')
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            failures = import_seasons(input_root, fresh_root, manifest_path=None)
+        problems += [f"{path}: import failed" for path in failures]
+        for input_file, fresh_file, kind in plan_imports(input_root, fresh_root):
+            if input_file in failures:
+                continue
+            year = os.path.basename(os.path.dirname(fresh_file))
+            committed = season_file(os.path.join(csv_root, year), kind)
+            if committed is None:
+                problems.append(f"{input_file}: no committed {kind} table for {year}")
+            elif not same_table(read_table(fresh_file), read_table(committed)):
+                problems.append(f"{input_file}: differs from {committed}")
+
+        copy_root = os.path.join(tmp, 'copy')
+        shutil.copytree(csv_root, copy_root)
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            failures = import_seasons(input_root, copy_root, manifest_path=None)
+        problems += [f"{path}: import over {csv_root} failed" for path in failures]
+        problems += [f"{os.path.join(csv_root, path)}: changed by import" for path in changed_files(csv_root, copy_root)]
+    if problems:
+        print(f"Importing {input_root} does not reproduce {csv_root}:")
+        for problem in problems:
+            print(problem)
+        return False
+    print(f"Importing {input_root} reproduces {csv_root}.")
+    return True
+
+if __name__ == '__main__':
+    sys.exit(0 if check_import_reproduces(*sys.argv[1:3]) else 1)
@@ -0,0 +1,39 @@
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+
+from parse import FALLBACK_PARSER, available_parsers, process_html_table
+
+def check_parser_parity(input_root='input'):
+    """Convert every input page with each parser backend and compare the CSV bytes."""
+    parsers = available_parsers()
+    if len(parsers) < 2:
+        print(f"Only {FALLBACK_PARSER} is available, nothing to compare.")
+        return True
+    mismatches = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in sorted(os.listdir(input_root)):
+            if not name.endswith('.html'):
+                continue
+            input_file = os.path.join(input_root, name)
+            outputs = {}
+            for parser in parsers:
+                output_file = os.path.join(tmp, parser, name.replace('.html', '.csv'))
+                with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+                    process_html_table(input_file, output_file, parser)
+                with open(output_file, 'rb') as f:
+                    outputs[parser] = f.read()
+            for parser in parsers:
+                if outputs[parser] != outputs[FALLBACK_PARSER]:
+                    mismatches.append((name, parser))
+    if mismatches:
+        print("CSV output differs from html.parser:")
+        for name, parser in mismatches:
+            print(f"{name}: {parser}")
+        return False
+    print(f"All inputs produce identical CSVs with: {', '.join(parsers)}")
+    return True
+
+if __name__ == '__main__':
+    sys.exit(0 if check_parser_parity() else 1)
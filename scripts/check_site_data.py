@@ -0,0 +1,54 @@
+import gzip
+import json
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+
+from build_site_data import build_site_data
+
+def read_site_data(data_root):
+    """The manifest and the unpacked bundle under data_root, or None for a missing file."""
+    def load(name, opener):
+        path = os.path.join(data_root, name)
+        if not os.path.exists(path):
+            return None
+        with opener(path, 'rt', encoding='utf-8') as f:
+            return json.load(f)
+    return load('manifest.json', open), load('bundle.json.gz', gzip.open)
+
+def check_site_data(csv_root='csv', data_root='data'):
+    """Build the site data from csv_root afresh and check it matches what is in data_root.
+
+    index.html reads data/ in preference to the CSVs, so a table edited,
+    imported or recomputed without rerunning build_site_data.py is served
+    stale until this passes again.
+    """
+    problems = []
+    manifest, bundle = read_site_data(data_root)
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            build_site_data(csv_root, tmp)
+        fresh_manifest, fresh_bundle = read_site_data(tmp)
+    if manifest is None or bundle is None:
+        problems.append(f"{data_root}: manifest.json or bundle.json.gz is missing")
+    else:
+        if manifest != fresh_manifest:
+            problems.append(f"{data_root}/manifest.json: file tree or row counts differ")
+        for path in sorted(bundle.keys() | fresh_bundle.keys()):
+            if path not in fresh_bundle:
+                problems.append(f"{path}: in the bundle but no longer in {csv_root}")
+            elif path not in bundle:
+                problems.append(f"{path}: missing from the bundle")
+            elif bundle[path] != fresh_bundle[path]:
+                problems.append(f"{path}: differs from the bundle")
+    if problems:
+        print(f"{data_root}/ is out of date with {csv_root}, rerun scripts/build_site_data.py:")
+        for problem in problems:
+            print(problem)
+        return False
+    print(f"{data_root}/ matches a fresh build from {csv_root}.")
+    return True
+
+if __name__ == '__main__':
+    sys.exit(0 if check_site_data(*sys.argv[1:3]) else 1)
@@ -0,0 +1,59 @@
+import os
+import subprocess
+import sys
+import tempfile
+
+# Copies of the page's table body in the small and the large test page
+SMALL_COPIES = 5
+LARGE_COPIES = 40
+# Peak RSS the large page may add over the small one, in KiB
+MAX_GROWTH_KB = 4 * 1024
+
+# Run in a fresh interpreter so each page's peak RSS is its own
+MEASURE = """
+import resource, sys
+from parse import stream_table_rows
+for row in stream_table_rows(sys.argv[1], sys.argv[2]):
+    pass
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+def replicate_page(input_file, output_file, copies):
+    """Write a copy of a page whose first table body is repeated `copies` times."""
+    with open(input_file, encoding='utf-8') as f:
+        html = f.read()
+    head, tbody, rest = html.partition('<tbody')
+    start = rest.index('>') + 1
+    body, close, tail = rest[start:].partition('</tbody>')
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(head + tbody + rest[:start])
+        for _ in range(copies):
+            f.write(body)
+        f.write(close + tail)
+
+def peak_rss_kb(page, kind):
+    """Peak RSS in KiB of a process that streams every row of a page."""
+    result = subprocess.run([sys.executable, '-c', MEASURE, page, kind], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    return int(result.stdout.split()[-1])
+
+def check_stream_memory(input_file='input/2024-transactions.html', kind='transactions'):
+    """Stream a page replicated 5 and 40 times and check peak memory does not grow with the file."""
+    peaks = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for copies in (SMALL_COPIES, LARGE_COPIES):
+            page = os.path.join(tmp, f'{copies}x.html')
+            replicate_page(input_file, page, copies)
+            peaks[copies] = peak_rss_kb(os.path.abspath(page), kind), os.path.getsize(page)
+    for copies, (peak, size) in peaks.items():
+        print(f"{copies:>3}x {input_file}: {size / 2**20:.1f} MiB page, {peak / 1024:.1f} MiB peak RSS")
+    growth = peaks[LARGE_COPIES][0] - peaks[SMALL_COPIES][0]
+    if growth > MAX_GROWTH_KB:
+        print(f"Streaming peak RSS grew by {growth / 1024:.1f} MiB with the page, "
+              f"more than {MAX_GROWTH_KB / 1024:.0f} MiB.")
+        return False
+    print("Streaming peak RSS stays flat as the page grows.")
+    return True
+
+if __name__ == '__main__':
+    sys.exit(0 if check_stream_memory(*sys.argv[1:3]) else 1)
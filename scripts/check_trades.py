@@ -0,0 +1,38 @@
+import sys
+
+from transaction_index import build_transaction_index
+
+# (season, week, user, partner user) of trades known from the league history
+KNOWN_TRADES = [
+    ('2019', 3, 'C.Sprague', 'S.Tibbetts'),
+]
+
+def check_trades(csv_root='csv', map_path='team_user_map.json', index=None):
+    """Check known trades come out as trade events for both users, and every trade resolves both sides."""
+    if index is None:
+        index = build_transaction_index(csv_root, map_path)
+    problems = []
+    for season, week, user, partner_user in KNOWN_TRADES:
+        trades = [e for e in index.for_week(season, week)
+                  if e.kind == 'trade' and {e.user, e.partner_user} == {user, partner_user}]
+        if not trades:
+            problems.append(f"{season} week {week}: no trade between {user} and {partner_user}")
+            continue
+        for name in (user, partner_user):
+            if not any(e in trades for e in index.for_user(name, 'trade')):
+                problems.append(f"{season} week {week}: trade missing from {name}'s transactions")
+    for event in index.events:
+        if event.kind == 'trade' and (event.user is None or event.partner_user is None):
+            problems.append(f"{event.season} week {event.week}: trade between {event.team!r} and "
+                            f"{event.partner!r} does not resolve both users")
+    if problems:
+        print("Trades are not indexed as expected:")
+        for problem in dict.fromkeys(problems):
+            print(problem)
+        return False
+    trades = sum(1 for event in index.events if event.kind == 'trade')
+    print(f"All {trades} trade events resolve both users.")
+    return True
+
+if __name__ == '__main__':
+    sys.exit(0 if check_trades(*sys.argv[1:3]) else 1)
@@ -0,0 +1,54 @@
+import filecmp
+import os
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+from check_import_reproduces import changed_files
+from watch import SeasonWatcher
+
+def check_watch_touch(input_root='input', csv_root='csv', map_path='team_user_map.json'):
+    """Touch every input page under a watcher and check csv/ and the all-time outputs do not change.
+
+    Runs on copies of input_root and csv_root, once with the default watcher
+    and once with import_pages set.
+    """
+    problems = []
+    for import_pages in (False, True):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_input = os.path.join(tmp, 'input')
+            tmp_csv = os.path.join(tmp, 'csv')
+            output_root = os.path.join(tmp, 'all_time')
+            shutil.copytree(input_root, tmp_input)
+            shutil.copytree(csv_root, tmp_csv, ignore=shutil.ignore_patterns('all_time'))
+            watcher = SeasonWatcher(tmp_input, tmp_csv, map_path, output_root, import_pages,
+                                    os.path.join(tmp, 'import_manifest.json'))
+            with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+                watcher.step()
+            before = os.path.join(tmp, 'before')
+            shutil.copytree(output_root, before)
+
+            later = time.time() + 5
+            for name in os.listdir(tmp_input):
+                os.utime(os.path.join(tmp_input, name), (later, later))
+            with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+                watcher.step()
+
+            mode = 'with --import' if import_pages else 'by default'
+            changed = changed_files(csv_root, tmp_csv)
+            problems += [f"{mode}: {os.path.join(csv_root, path)} changed" for path in changed if path != 'all_time']
+            problems += [f"{mode}: all-time {name} changed"
+                         for name in os.listdir(before)
+                         if not filecmp.cmp(os.path.join(before, name), os.path.join(output_root, name), shallow=False)]
+    if problems:
+        print("Touching the input pages changed the watched outputs:")
+        for problem in problems:
+            print(problem)
+        return False
+    print("Touching the input pages leaves csv/ and the all-time outputs unchanged.")
+    return True
+
+if __name__ == '__main__':
+    sys.exit(0 if check_watch_touch(*sys.argv[1:4]) else 1)
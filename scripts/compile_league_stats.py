@@ -1,66 +1,42 @@
-import os
 import csv
-import json
 
-def load_team_user_map(map_path='team_user_map.json'):
-    with open(map_path, encoding='utf-8') as f:
-        mapping = json.load(f)
-    team_to_user = {}
-    for entry in mapping:
-        user = entry['user']
-        for team in entry['teams']:
-            team_to_user[team] = user
-    return team_to_user
+import profiling
+from league_data import load_league
 
-def parse_record(record):
-    # Expects format like '10-3-1' (wins-losses-ties)
-    parts = record.strip().split('-')
-    if len(parts) == 3:
-        return tuple(int(x) for x in parts)
-    elif len(parts) == 2:
-        return int(parts[0]), int(parts[1]), 0
-    else:
-        return 0, 0, 0
+try:
+    from league_arrays import ColumnarLeague
+except ImportError:  # numpy is not installed, aggregate row by row
+    ColumnarLeague = None
 
-def compile_league_stats(csv_root='csv', map_path='team_user_map.json', output_csv='cumulative_stats.csv'):
-    team_to_user = load_team_user_map(map_path)
+def aggregate_team_seasons(league):
     user_stats = {}
-    for year_dir in sorted(os.listdir(csv_root)):
-        year_path = os.path.join(csv_root, year_dir)
-        if os.path.isdir(year_path):
-            teams_csv = os.path.join(year_path, 'teams.csv')
-            if os.path.isfile(teams_csv):
-                with open(teams_csv, newline='', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    # Try to find relevant columns
-                    colnames = [c.lower() for c in reader.fieldnames]
-                    team_col = next((c for c in reader.fieldnames if c.lower() in ['team', 'team name', 'name']), reader.fieldnames[0])
-                    record_col = next((c for c in reader.fieldnames if 'record' in c.lower()), None)
-                    pf_col = next((c for c in reader.fieldnames if 'points for' in c.lower() or 'pf' == c.lower() or 'points scored' in c.lower()), None)
-                    pa_col = next((c for c in reader.fieldnames if 'points against' in c.lower() or 'pa' == c.lower()), None)
-                    for row in reader:
-                        team = row.get(team_col, '').strip()
-                        user = team_to_user.get(team)
-                        if not user:
-                            continue  # skip unmapped teams
-                        record = row.get(record_col, '').strip() if record_col else ''
-                        wins, losses, ties = parse_record(record)
-                        def parse_float(val):
-                            if not val:
-                                return 0.0
-                            try:
-                                return float(str(val).replace(',', ''))
-                            except Exception:
-                                return 0.0
-                        pf = parse_float(row.get(pf_col, 0)) if pf_col and row.get(pf_col) else 0.0
-                        pa = parse_float(row.get(pa_col, 0)) if pa_col and row.get(pa_col) else 0.0
-                        if user not in user_stats:
-                            user_stats[user] = {'wins': 0, 'losses': 0, 'ties': 0, 'pf': 0.0, 'pa': 0.0}
-                        user_stats[user]['wins'] += wins
-                        user_stats[user]['losses'] += losses
-                        user_stats[user]['ties'] += ties
-                        user_stats[user]['pf'] += pf
-                        user_stats[user]['pa'] += pa
+    for team_season in league.team_seasons():
+        user = team_season.user
+        if not user:
+            continue  # skip unmapped teams
+        if user not in user_stats:
+            user_stats[user] = {'wins': 0, 'losses': 0, 'ties': 0, 'pf': 0.0, 'pa': 0.0}
+        user_stats[user]['wins'] += team_season.wins
+        user_stats[user]['losses'] += team_season.losses
+        user_stats[user]['ties'] += team_season.ties
+        user_stats[user]['pf'] += team_season.points_for
+        user_stats[user]['pa'] += team_season.points_against
+    return user_stats
+
+def compile_league_stats(csv_root='csv', map_path='team_user_map.json', output_csv='cumulative_stats.csv', league=None):
+    if league is None:
+        league = load_league(csv_root, map_path, kinds=['teams'])
+    with profiling.stage('aggregate:records'):
+        if ColumnarLeague is not None:
+            user_stats = ColumnarLeague(league).regular_season_stats()
+        else:
+            user_stats = aggregate_team_seasons(league)
+    with profiling.stage('write:records') as timing:
+        timing.rows = len(user_stats)
+        write_league_stats(user_stats, output_csv)
+    return user_stats
+
+def write_league_stats(user_stats, output_csv='cumulative_stats.csv'):
     # Prepare and sort output rows by points for (desc)
     rows = []
     for user, stats in user_stats.items():
@@ -0,0 +1,140 @@
+import csv
+import os
+import re
+import sys
+from collections import defaultdict
+
+from league_data import find_column, load_league, parse_float
+from transaction_index import build_transaction_index, player_key
+
+# 'David Johnson · RB · (ARI)', 'Christian McCaffrey   RB   (CAR)' and 'Justin Jefferson WR (MIN)'
+DRAFT_PLAYER = re.compile(r'^(?P<name>.+?)\s+(?:·\s+)?(?P<position>[A-Z/]+)\s+(?:·\s+)?\((?P<team>[A-Z]*)\)\s*$')
+
+# Starters per team at each position; the next player drafted after that many is replacement level
+STARTERS = {'QB': 1, 'RB': 2, 'WR': 2, 'TE': 1, 'K': 1, 'DEF': 1}
+
+def parse_draft_player(text):
+    """Split a draft.csv player cell into (name, position, nfl team)."""
+    match = DRAFT_PLAYER.match(text.strip())
+    if not match:
+        return ' '.join(text.split()), '', ''
+    return match.group('name'), match.group('position'), match.group('team')
+
+class PickValue:
+    __slots__ = ('season', 'overall', 'round', 'player', 'position', 'nfl_team', 'team', 'user',
+                 'value', 'games', 'times_added', 'dropped_by_drafter', 'replacement', 'vor')
+
+    def __init__(self, pick, player, position, nfl_team):
+        self.season = pick.season
+        self.overall = pick.overall
+        self.round = pick.round
+        self.player = player
+        self.position = position
+        self.nfl_team = nfl_team
+        self.team = pick.team
+        self.user = pick.user
+        self.value = 0.0
+        self.games = 0
+        self.times_added = 0
+        self.dropped_by_drafter = False
+        self.replacement = 0.0
+        self.vor = 0.0
+
+def load_performances(perf_csv='csv/all_time/top_player_perf.csv'):
+    """Index weekly performances by (season, player) as lists of PPR scores."""
+    index = defaultdict(list)
+    if not os.path.isfile(perf_csv):
+        return index
+    with open(perf_csv, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        season_col = find_column(reader.fieldnames, exact=['season', 'seaon'])
+        name_col = find_column(reader.fieldnames, exact=['name', 'player'])
+        ppr_col = find_column(reader.fieldnames, exact=['ppr', 'points'])
+        for row in reader:
+            index[(row[season_col].strip(), player_key(row[name_col]))].append(parse_float(row[ppr_col]))
+    return index
+
+def value_picks(league, performances, transactions):
+    """Score every draft pick against the performance and transaction indexes."""
+    picks = []
+    for draft_pick in league.draft_picks():
+        pick = PickValue(draft_pick, *parse_draft_player(draft_pick.player))
+        key = player_key(pick.player)
+        scores = performances.get((pick.season, key), ())
+        pick.value = sum(scores)
+        pick.games = len(scores)
+        events = [e for e in transactions.for_player(pick.player) if e.season == pick.season]
+        pick.times_added = sum(1 for e in events if e.kind == 'add')
+        pick.dropped_by_drafter = any(e.kind == 'drop' and e.user == pick.user for e in events)
+        picks.append(pick)
+
+    # Replacement level per season and position: the best player after the starters
+    teams_per_season = {year: len(season.teams) or len({p.user for p in season.draft}) for year, season in league.seasons.items()}
+    by_slot = defaultdict(list)
+    for pick in picks:
+        by_slot[(pick.season, pick.position)].append(pick)
+    for (season, position), slot in by_slot.items():
+        ranked = sorted((p.value for p in slot), reverse=True)
+        starters = teams_per_season.get(season, 0) * STARTERS.get(position, 1)
+        replacement = ranked[starters] if starters < len(ranked) else 0.0
+        for pick in slot:
+            pick.replacement = replacement
+            pick.vor = pick.value - replacement
+    return picks
+
+def draft_efficiency(picks):
+    stats = {}
+    for pick in picks:
+        if not pick.user:
+            continue
+        s = stats.setdefault(pick.user, {'picks': 0, 'hits': 0, 'value': 0.0, 'vor': 0.0, 'dropped': 0})
+        s['picks'] += 1
+        s['hits'] += pick.games > 0
+        s['value'] += pick.value
+        s['vor'] += pick.vor
+        s['dropped'] += pick.dropped_by_drafter
+    return stats
+
+def positional_value(picks):
+    stats = {}
+    for pick in picks:
+        s = stats.setdefault((pick.season, pick.position), {'picks': 0, 'value': 0.0, 'replacement': pick.replacement, 'best': None})
+        s['picks'] += 1
+        s['value'] += pick.value
+        if s['best'] is None or pick.vor > s['best'].vor:
+            s['best'] = pick
+    return stats
+
+# Kept out of csv/, which build_site_data publishes: until there is full weekly
+# scoring the top-game file is too sparse for these tables to mean much
+def compile_draft_value(csv_root='csv', map_path='team_user_map.json', perf_csv='csv/all_time/top_player_perf.csv',
+                        output_root='reports', league=None):
+    if league is None:
+        league = load_league(csv_root, map_path, kinds=['teams', 'draft', 'transactions'])
+    picks = value_picks(league, load_performances(perf_csv), build_transaction_index(league=league))
+    os.makedirs(output_root, exist_ok=True)
+
+    efficiency_csv = os.path.join(output_root, 'draft_efficiency.csv')
+    rows = sorted(draft_efficiency(picks).items(), key=lambda item: item[1]['vor'], reverse=True)
+    with open(efficiency_csv, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['User', 'Picks', 'Picks With Top Games', 'Hit Rate', 'Top Game Points',
+                         'Points Per Pick', 'Value Over Replacement', 'Picks Dropped'])
+        for user, s in rows:
+            writer.writerow([user, s['picks'], s['hits'], f"{s['hits'] / s['picks']:.3f}", f"{s['value']:.2f}",
+                             f"{s['value'] / s['picks']:.2f}", f"{s['vor']:.2f}", s['dropped']])
+
+    positional_csv = os.path.join(output_root, 'draft_positional_value.csv')
+    with open(positional_csv, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Season', 'Position', 'Picks', 'Top Game Points', 'Replacement Value',
+                         'Best Pick', 'Best Pick Overall', 'Best Pick User', 'Best Pick VOR'])
+        for (season, position), s in sorted(positional_value(picks).items()):
+            best = s['best']
+            writer.writerow([season, position, s['picks'], f"{s['value']:.2f}", f"{s['replacement']:.2f}",
+                             best.player, best.overall, best.user or '', f"{best.vor:.2f}"])
+    print(f"Draft value written to {efficiency_csv} and {positional_csv}")
+    return picks
+
+if __name__ == '__main__':
+    compile_draft_value(*sys.argv[1:3])
@@ -0,0 +1,153 @@
+import argparse
+import csv
+import json
+import os
+
+import numpy as np
+
+from league_data import load_league, load_matchups, season_file
+from team_map import load_team_resolver
+
+# Layers of the users x users stats array; [layer, a, b] is from a's point of view against b
+WINS, LOSSES, TIES, POINTS_FOR, POINTS_AGAINST, PLAYOFF_MEETINGS = range(6)
+
+class HeadToHead:
+    """Dense users x users matrix of every head-to-head result.
+
+    Results are kept per (season, week) as well, so applying a week again,
+    for example after each game of that week finishes, replaces that week's
+    contribution instead of recomputing the whole history.
+    """
+
+    def __init__(self, users=()):
+        self.users = list(users)
+        self.index = {user: i for i, user in enumerate(self.users)}
+        self.stats = np.zeros((6, len(self.users), len(self.users)))
+        self.weeks = {}
+
+    def reserve(self, capacity):
+        """Make room for `capacity` users in one allocation."""
+        size = self.stats.shape[1]
+        if capacity > size:
+            stats = np.zeros((6, capacity, capacity))
+            stats[:, :size, :size] = self.stats
+            self.stats = stats
+
+    def user_id(self, user):
+        if user not in self.index:
+            # Grow geometrically, so users first seen one week at a time cost amortised O(n^2) copying
+            if len(self.users) == self.stats.shape[1]:
+                self.reserve(max(8, 2 * len(self.users)))
+            self.index[user] = len(self.users)
+            self.users.append(user)
+        return self.index[user]
+
+    @property
+    def matrix(self):
+        """The stats array trimmed to the users seen so far."""
+        n = len(self.users)
+        return self.stats[:, :n, :n]
+
+    def add_game(self, game, sign=1):
+        user, opponent, score, opponent_score, playoff = game
+        a, b = self.user_id(user), self.user_id(opponent)
+        result = WINS if score > opponent_score else LOSSES if score < opponent_score else TIES
+        flipped = {WINS: LOSSES, LOSSES: WINS, TIES: TIES}[result]
+        self.stats[result, a, b] += sign
+        self.stats[flipped, b, a] += sign
+        self.stats[POINTS_FOR, a, b] += sign * score
+        self.stats[POINTS_AGAINST, a, b] += sign * opponent_score
+        self.stats[POINTS_FOR, b, a] += sign * opponent_score
+        self.stats[POINTS_AGAINST, b, a] += sign * score
+        if playoff:
+            self.stats[PLAYOFF_MEETINGS, a, b] += sign
+            self.stats[PLAYOFF_MEETINGS, b, a] += sign
+
+    def apply_week(self, season, week, matchups):
+        """Add one week's games, replacing whatever was applied for that week before."""
+        key = f'{season}:{week}'
+        for game in self.weeks.pop(key, []):
+            self.add_game(game, -1)
+        games = [
+            (m.team_user, m.opponent_user, m.team_score, m.opponent_score, m.is_playoff)
+            for m in matchups if m.team_user and m.opponent_user
+        ]
+        for game in games:
+            self.add_game(game)
+        self.weeks[key] = games
+
+    def apply_league(self, league):
+        by_week = {}
+        users = set()
+        for m in league.matchups():
+            by_week.setdefault((m.season, m.week), []).append(m)
+            if m.team_user and m.opponent_user:
+                users.update((m.team_user, m.opponent_user))
+        self.reserve(len(self.users) + len(users - self.index.keys()))
+        for (season, week), matchups in by_week.items():
+            self.apply_week(season, week, matchups)
+
+    def record(self, user, opponent):
+        a, b = self.index[user], self.index[opponent]
+        return {name: self.stats[layer, a, b] for name, layer in (
+            ('wins', WINS), ('losses', LOSSES), ('ties', TIES), ('points_for', POINTS_FOR),
+            ('points_against', POINTS_AGAINST), ('playoff_meetings', PLAYOFF_MEETINGS))}
+
+    def write_csv(self, output_csv):
+        stats = self.matrix
+        games = stats[WINS] + stats[LOSSES] + stats[TIES]
+        with open(output_csv, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['User', 'Opponent', 'Wins', 'Losses', 'Ties', 'Games Played',
+                             'Points For', 'Points Against', 'Playoff Meetings'])
+            order = sorted(range(len(self.users)), key=lambda i: self.users[i])
+            for a in order:
+                for b in order:
+                    if games[a, b] > 0:
+                        writer.writerow([
+                            self.users[a], self.users[b],
+                            int(stats[WINS, a, b]), int(stats[LOSSES, a, b]), int(stats[TIES, a, b]),
+                            int(games[a, b]), f"{stats[POINTS_FOR, a, b]:.2f}",
+                            f"{stats[POINTS_AGAINST, a, b]:.2f}", int(stats[PLAYOFF_MEETINGS, a, b]),
+                        ])
+
+    def save(self, state_path):
+        np.savez_compressed(state_path, users=np.array(self.users), stats=self.matrix,
+                            weeks=np.array(json.dumps(self.weeks)))
+
+    @classmethod
+    def load(cls, state_path):
+        with np.load(state_path) as state:
+            h2h = cls(state['users'].tolist())
+            h2h.stats = state['stats']
+            h2h.weeks = {key: [tuple(game) for game in games]
+                         for key, games in json.loads(str(state['weeks'])).items()}
+        return h2h
+
+def build_head_to_head(csv_root='csv', map_path='team_user_map.json', league=None):
+    if league is None:
+        league = load_league(csv_root, map_path, kinds=['matchups'])
+    h2h = HeadToHead()
+    h2h.apply_league(league)
+    return h2h
+
+def update_week(season, week, csv_root='csv', map_path='team_user_map.json', state_path='head_to_head_state.npz'):
+    """Re-read one season's matchups.csv and apply only the given week to the saved matrix."""
+    h2h = HeadToHead.load(state_path) if os.path.isfile(state_path) else build_head_to_head(csv_root, map_path)
+    path = season_file(os.path.join(csv_root, str(season)), 'matchups')
+    matchups = load_matchups(path, str(season), load_team_resolver(map_path)) if path else []
+    h2h.apply_week(str(season), week, [m for m in matchups if m.week == week])
+    return h2h
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build the all-time head-to-head matrix.')
+    parser.add_argument('--week', nargs=2, type=int, metavar=('SEASON', 'WEEK'),
+                        help='apply one week to the saved matrix instead of rebuilding it')
+    parser.add_argument('--output', default='csv/all_time/head_to_head.csv')
+    parser.add_argument('--state', default='head_to_head_state.npz')
+    args = parser.parse_args()
+
+    h2h = update_week(*args.week, state_path=args.state) if args.week else build_head_to_head()
+    h2h.save(args.state)
+    h2h.write_csv(args.output)
+    print(f"Head-to-head records written to {args.output}")
@@ -0,0 +1,203 @@
+import csv
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+
+import profiling
+from league_data import season_file
+from parse import PARSER_VERSION, TABLE_SIGNATURES, process_html_table, sanitize_ascii
+
+# input/<year>-<kind>.html, with an optional -real suffix on some seasons
+INPUT_NAME = re.compile(r'^(\d{4})-([a-z]+)(?:-real)?\.html$')
+
+def plan_imports(input_root='input', csv_root='csv'):
+    """Map every recognised export page to the CSV it should produce, keeping the name of an existing one.
+
+    When a season has both <year>-<kind>.html and <year>-<kind>-real.html,
+    only the -real page is imported, so two pages never write the same CSV.
+    """
+    pages = {}
+    for name in sorted(os.listdir(input_root)):
+        match = INPUT_NAME.match(name)
+        if not match or match.group(2) not in TABLE_SIGNATURES:
+            continue
+        key = match.groups()
+        if key in pages and not name.endswith('-real.html'):
+            continue
+        pages[key] = name
+    jobs = []
+    for (year, kind), name in sorted(pages.items()):
+        year_path = os.path.join(csv_root, year)
+        output_file = season_file(year_path, kind) or os.path.join(year_path, f'{kind}.csv')
+        jobs.append((os.path.join(input_root, name), output_file, kind))
+    return jobs
+
+def read_table(path):
+    """Read a CSV as rows of cells with whitespace and non-ASCII normalised, as the parser writes them."""
+    with open(path, newline='', encoding='utf-8') as f:
+        return [[sanitize_ascii(cell) for cell in row] for row in csv.reader(f)]
+
+def same_cell(new, old):
+    # Export pages cut long team names short ('In Godwin We (no longe...'); the kept CSV may have them whole
+    return new == old or (new.endswith('...') and old.startswith(new[:-3]))
+
+def same_table(new, old):
+    return len(new) == len(old) and all(
+        len(a) == len(b) and all(same_cell(x, y) for x, y in zip(a, b)) for a, b in zip(new, old))
+
+def install(new_file, output_file, force=False, keep_edits=False):
+    """Move a fresh conversion into place, returning 'created', 'updated', 'unchanged' or 'kept'.
+
+    An existing CSV with the same content is left alone, so hand fixes to its
+    text survive a re-import. One with different headers is not overwritten
+    unless force is set, since the loaders would no longer read it the same way,
+    and with keep_edits a differing CSV is kept as it is.
+    """
+    if not os.path.isfile(output_file):
+        os.replace(new_file, output_file)
+        return 'created'
+    new, old = read_table(new_file), read_table(output_file)
+    if same_table(new, old):
+        os.remove(new_file)
+        return 'unchanged'
+    if keep_edits and not force:
+        os.remove(new_file)
+        return 'kept'
+    if new[:1] != old[:1] and not force:
+        os.remove(new_file)
+        raise ValueError(f"{output_file} has different columns, not overwriting (use --force)")
+    os.replace(new_file, output_file)
+    return 'updated'
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_manifest(manifest_path):
+    if not manifest_path or not os.path.isfile(manifest_path):
+        return {}
+    with open(manifest_path, encoding='utf-8') as f:
+        return json.load(f)
+
+def save_manifest(manifest, manifest_path):
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=4, sort_keys=True)
+
+def is_fresh(entry, input_hash, output_file):
+    """A cached conversion is fresh if the input, parser version and output are all unchanged."""
+    return (entry is not None
+            and entry.get('input_hash') == input_hash
+            and entry.get('parser_version') == PARSER_VERSION
+            and entry.get('output') == output_file
+            and os.path.isfile(output_file)
+            and entry.get('output_hash') == file_hash(output_file))
+
+def was_edited(entry, output_file):
+    """True if the output exists but is not the file this importer last wrote, e.g. it was fixed by hand."""
+    return os.path.isfile(output_file) and (entry is None or entry.get('kept', False)
+                                            or entry.get('output_hash') != file_hash(output_file))
+
+def default_workers():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def convert(input_file, output_file, kind, parser=None, stream=False, force=False, keep_edits=False):
+    """Run one conversion quietly, returning (row count, install status, error message, worker profile)."""
+    new_file = output_file + '.import'
+    try:
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull), \
+                profiling.stage(f'parse:{kind}', input_file) as timing:
+            timing.rows = process_html_table(input_file, new_file, parser, kind, stream)
+        return timing.rows, install(new_file, output_file, force, keep_edits), None, profiling.take()
+    except SystemExit:
+        return 0, None, f"no {kind} table found", profiling.take()
+    except Exception as e:
+        return 0, None, str(e), profiling.take()
+    finally:
+        if os.path.exists(new_file):
+            os.remove(new_file)
+
+def import_seasons(input_root='input', csv_root='csv', workers=None, parser=None,
+                   manifest_path='import_manifest.json', force=False, only=None, stream=False):
+    """Convert every page in input_root to csv_root/<year>/<kind>.csv on a process pool.
+
+    Pages whose content hash, parser version and output CSV match the manifest
+    are skipped. A CSV that differs from what the manifest says was last
+    written, or that was never imported, is kept with a warning rather than
+    overwritten, and recorded as kept so it is not reconverted until its
+    page or the file changes. Pass force=True to rebuild everything and to overwrite those
+    CSVs and ones whose columns differ from the page's (see install). `only`
+    limits the run to the given input files, and stream=True converts with
+    bounded memory.
+    """
+    jobs = plan_imports(input_root, csv_root)
+    if only is not None:
+        only = {os.path.normpath(path) for path in only}
+        jobs = [job for job in jobs if os.path.normpath(job[0]) in only]
+    if not jobs:
+        print(f"No <year>-<kind>.html files found in {input_root}")
+        return []
+    manifest = load_manifest(manifest_path)
+    with profiling.stage('hash_inputs'):
+        input_hashes = {input_file: file_hash(input_file) for input_file, _, _ in jobs}
+    hits = 0
+    if not force:
+        stale = [job for job in jobs if not is_fresh(manifest.get(job[0]), input_hashes[job[0]], job[1])]
+        hits = len(jobs) - len(stale)
+        jobs = stale
+    print(f"Cache: {hits} hits, {len(jobs)} misses")
+    if not jobs:
+        return []
+    workers = min(workers or default_workers(), len(jobs))
+    # Start the largest pages first so the slowest file is not queued behind small ones
+    jobs.sort(key=lambda job: os.path.getsize(job[0]), reverse=True)
+    failures = []
+    kept = []
+    with profiling.stage('import'), ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(convert, input_file, output_file, kind, parser, stream, force,
+                               was_edited(manifest.get(input_file), output_file)): (input_file, output_file)
+                   for input_file, output_file, kind in jobs}
+        for future in as_completed(futures):
+            input_file, output_file = futures[future]
+            rows, status, error, profile = future.result()
+            profiling.merge(profile)
+            if error:
+                failures.append(input_file)
+                print(f"❌ {input_file}: {error}")
+            else:
+                # A kept file is recorded too, so the same page is a cache hit next time;
+                # 'kept' stops a later change to the page from overwriting it without --force
+                manifest[input_file] = {
+                    'input_hash': input_hashes[input_file],
+                    'parser_version': PARSER_VERSION,
+                    'output': output_file,
+                    'output_hash': file_hash(output_file),
+                    'kept': status == 'kept',
+                }
+                if status == 'kept':
+                    kept.append(output_file)
+                    print(f"⚠️  {output_file} differs from the last import of {input_file}, "
+                          "keeping it (use --force to overwrite)")
+                else:
+                    print(f"✅ {input_file} -> {output_file} ({rows} rows, {status})")
+    if manifest_path:
+        save_manifest(manifest, manifest_path)
+    print(f"Imported {len(jobs) - len(failures) - len(kept)}/{len(jobs)} files using {workers} workers"
+          + (f", kept {len(kept)} edited" if kept else ""))
+    return failures
+
+if __name__ == '__main__':
+    args = [arg for arg in sys.argv[1:] if arg not in ('--force', '--stream')]
+    input_root = args[0] if len(args) > 0 else 'input'
+    csv_root = args[1] if len(args) > 1 else 'csv'
+    sys.exit(1 if import_seasons(input_root, csv_root, force='--force' in sys.argv,
+                                 stream='--stream' in sys.argv) else 0)
@@ -0,0 +1,106 @@
+import numpy as np
+
+# Game_Type codes for the matchup columns
+REGULAR, PLAYOFF, CHAMPIONSHIP, CONSOLATION = 0, 1, 2, 3
+
+def game_type_code(game_type):
+    game_type = game_type.lower()
+    if 'championship' in game_type:
+        return CHAMPIONSHIP
+    if 'playoff' in game_type:
+        return PLAYOFF
+    if 'consolation' in game_type:
+        return CONSOLATION
+    return REGULAR
+
+def first_seen_order(ids):
+    """Return the distinct ids in the order they first appear."""
+    unique, first = np.unique(ids, return_index=True)
+    return unique[np.argsort(first, kind='stable')]
+
+class ColumnarLeague:
+    """Team seasons and matchups of a League as parallel NumPy arrays.
+
+    Users are stored as integer ids into `users`; rows whose team does not
+    resolve to a user get id -1. Aggregates are computed with bincount
+    group-bys over those ids, which add rows in the same order as the
+    per-row loops they replace, so the sums come out identical.
+    """
+
+    def __init__(self, league):
+        self.users = sorted({r.user for r in league.team_seasons() if r.user}
+                            | {u for m in league.matchups() for u in (m.team_user, m.opponent_user) if u})
+        user_ids = {user: i for i, user in enumerate(self.users)}
+        lookup = lambda user: user_ids.get(user, -1)
+
+        teams = list(league.team_seasons())
+        self.team_season = np.array([int(r.season) for r in teams], dtype=np.int16)
+        self.team_user = np.array([lookup(r.user) for r in teams], dtype=np.int32)
+        self.wins = np.array([r.wins for r in teams], dtype=np.int32)
+        self.losses = np.array([r.losses for r in teams], dtype=np.int32)
+        self.ties = np.array([r.ties for r in teams], dtype=np.int32)
+        self.points_for = np.array([r.points_for for r in teams], dtype=np.float64)
+        self.points_against = np.array([r.points_against for r in teams], dtype=np.float64)
+
+        matchups = list(league.matchups())
+        self.matchup_season = np.array([int(m.season) for m in matchups], dtype=np.int16)
+        self.matchup_week = np.array([m.week or 0 for m in matchups], dtype=np.int16)
+        self.home_user = np.array([lookup(m.team_user) for m in matchups], dtype=np.int32)
+        self.away_user = np.array([lookup(m.opponent_user) for m in matchups], dtype=np.int32)
+        self.home_score = np.array([m.team_score for m in matchups], dtype=np.float64)
+        self.away_score = np.array([m.opponent_score for m in matchups], dtype=np.float64)
+        self.game_type = np.array([game_type_code(m.game_type) for m in matchups], dtype=np.int8)
+
+    def group_sum(self, ids, values):
+        return np.bincount(ids, weights=values, minlength=len(self.users))
+
+    def regular_season_stats(self):
+        """Per-user wins, losses, ties, pf and pa from teams.csv, like compile_league_stats."""
+        mapped = self.team_user >= 0
+        ids = self.team_user[mapped]
+        wins = self.group_sum(ids, self.wins[mapped])
+        losses = self.group_sum(ids, self.losses[mapped])
+        ties = self.group_sum(ids, self.ties[mapped])
+        pf = self.group_sum(ids, self.points_for[mapped])
+        pa = self.group_sum(ids, self.points_against[mapped])
+        return {
+            self.users[i]: {'wins': int(wins[i]), 'losses': int(losses[i]), 'ties': int(ties[i]),
+                            'pf': float(pf[i]), 'pa': float(pa[i])}
+            for i in first_seen_order(ids)
+        }
+
+    def playoff_stats(self):
+        """Per-user playoff record, points and championships, like the playoff compile_league_stats."""
+        games = ((self.home_user >= 0) & (self.away_user >= 0)
+                 & ((self.game_type == PLAYOFF) | (self.game_type == CHAMPIONSHIP)))
+        home_won = self.home_score[games] >= self.away_score[games]
+        winner = np.where(home_won, self.home_user[games], self.away_user[games])
+        loser = np.where(home_won, self.away_user[games], self.home_user[games])
+        winner_score = np.where(home_won, self.home_score[games], self.away_score[games])
+        loser_score = np.where(home_won, self.away_score[games], self.home_score[games])
+        final = self.game_type[games] == CHAMPIONSHIP
+
+        # Interleave winner and loser rows so points are summed in game order
+        ids = np.column_stack((winner, loser)).ravel()
+        points_for = np.column_stack((winner_score, loser_score)).ravel()
+        points_against = np.column_stack((loser_score, winner_score)).ravel()
+        won = np.column_stack((np.ones_like(final), np.zeros_like(final))).ravel()
+        in_final = np.repeat(final, 2)
+
+        wins = self.group_sum(ids, won)
+        pf = self.group_sum(ids, points_for)
+        pa = self.group_sum(ids, points_against)
+        appearances = self.group_sum(ids, in_final)
+        championships = self.group_sum(ids, won & in_final)
+        games_played = np.bincount(ids, minlength=len(self.users))
+        return {
+            self.users[i]: {
+                'playoff_wins': int(wins[i]),
+                'playoff_losses': int(games_played[i] - wins[i]),
+                'playoff_points_for': float(pf[i]),
+                'playoff_points_against': float(pa[i]),
+                'championships': int(championships[i]),
+                'championship_appearances': int(appearances[i]),
+            }
+            for i in first_seen_order(ids)
+        }
@@ -0,0 +1,273 @@
+import os
+import csv
+
+import profiling
+from team_map import load_team_resolver
+
+# File names each kind of season table has been saved under, in order of preference
+SEASON_FILES = {
+    'teams': ['teams.csv'],
+    'matchups': ['matchups.csv'],
+    'transactions': ['transactions.csv', 'transactons.csv'],
+    'draft': ['draft.csv'],
+}
+
+# A trade row names both teams in its Team cell, joined like this by the importer
+TEAM_SEPARATOR = ' / '
+
+def parse_record(record):
+    # Expects format like '10-3-1' (wins-losses-ties)
+    parts = record.strip().split('-')
+    if len(parts) == 3:
+        return tuple(int(x) for x in parts)
+    elif len(parts) == 2:
+        return int(parts[0]), int(parts[1]), 0
+    else:
+        return 0, 0, 0
+
+def parse_float(val):
+    """Parse numbers like '1,840.24' or '$12', returning 0.0 for anything else."""
+    if not val:
+        return 0.0
+    try:
+        return float(str(val).replace(',', '').replace('$', ''))
+    except ValueError:
+        return 0.0
+
+def parse_int(val):
+    try:
+        return int(str(val).strip())
+    except ValueError:
+        return None
+
+def parse_week(val):
+    # 'Week 16' -> 16
+    return parse_int(str(val).replace('Week', ''))
+
+def parse_pick(val):
+    # '2.10 (22)' -> (2, 10, 22)
+    pick, _, overall = str(val).partition('(')
+    round_number, _, round_pick = pick.strip().partition('.')
+    return parse_int(round_number), parse_int(round_pick), parse_int(overall.rstrip(')'))
+
+def find_column(fieldnames, exact=(), contains=(), default=None):
+    """Return the first column whose lowercased name equals or contains one of the candidates."""
+    for c in fieldnames:
+        name = c.lower()
+        if name in exact or any(candidate in name for candidate in contains):
+            return c
+    return default
+
+class TeamSeason:
+    __slots__ = ('season', 'team', 'username', 'user', 'wins', 'losses', 'ties',
+                 'points_for', 'points_against', 'inseason_rank', 'final_rank')
+
+    def __init__(self, season, team, username, user, wins, losses, ties,
+                 points_for, points_against, inseason_rank, final_rank):
+        self.season = season
+        self.team = team
+        self.username = username
+        self.user = user
+        self.wins = wins
+        self.losses = losses
+        self.ties = ties
+        self.points_for = points_for
+        self.points_against = points_against
+        self.inseason_rank = inseason_rank
+        self.final_rank = final_rank
+
+class Matchup:
+    __slots__ = ('season', 'week', 'team', 'team_user', 'team_score',
+                 'opponent', 'opponent_user', 'opponent_score', 'game_type')
+
+    def __init__(self, season, week, team, team_user, team_score,
+                 opponent, opponent_user, opponent_score, game_type):
+        self.season = season
+        self.week = week
+        self.team = team
+        self.team_user = team_user
+        self.team_score = team_score
+        self.opponent = opponent
+        self.opponent_user = opponent_user
+        self.opponent_score = opponent_score
+        self.game_type = game_type
+
+    @property
+    def is_playoff(self):
+        game_type = self.game_type.lower()
+        return 'playoff' in game_type or 'championship' in game_type
+
+    @property
+    def is_championship(self):
+        return 'championship' in self.game_type.lower()
+
+class Transaction:
+    __slots__ = ('season', 'week', 'type', 'team', 'user', 'transaction', 'faab', 'partner', 'partner_user')
+
+    def __init__(self, season, week, type, team, user, transaction, faab, partner='', partner_user=None):
+        self.season = season
+        self.week = week
+        self.type = type
+        self.team = team
+        self.user = user
+        self.transaction = transaction
+        self.faab = faab
+        # The other team in a trade, empty for moves that involve one team
+        self.partner = partner
+        self.partner_user = partner_user
+
+class DraftPick:
+    __slots__ = ('season', 'round', 'pick', 'overall', 'player', 'team', 'user', 'keeper')
+
+    def __init__(self, season, round, pick, overall, player, team, user, keeper):
+        self.season = season
+        self.round = round
+        self.pick = pick
+        self.overall = overall
+        self.player = player
+        self.team = team
+        self.user = user
+        self.keeper = keeper
+
+class Season:
+    __slots__ = ('year', 'teams', 'matchups', 'transactions', 'draft')
+
+    def __init__(self, year):
+        self.year = year
+        self.teams = []
+        self.matchups = []
+        self.transactions = []
+        self.draft = []
+
+class League:
+    """Every season under a csv root, loaded once and shared between reports."""
+
+    def __init__(self, seasons, resolve_user):
+        self.seasons = seasons
+        self.resolve_user = resolve_user
+
+    def team_seasons(self):
+        for season in self.seasons.values():
+            yield from season.teams
+
+    def matchups(self):
+        for season in self.seasons.values():
+            yield from season.matchups
+
+    def transactions(self):
+        for season in self.seasons.values():
+            yield from season.transactions
+
+    def draft_picks(self):
+        for season in self.seasons.values():
+            yield from season.draft
+
+def season_file(year_path, kind):
+    """Return the path of a season table, allowing for the names it has been saved under."""
+    for name in SEASON_FILES[kind]:
+        path = os.path.join(year_path, name)
+        if os.path.isfile(path):
+            return path
+    return None
+
+def read_rows(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        return reader.fieldnames or [], list(reader)
+
+def resolve_spaced(resolve_user, team):
+    """Resolve a team name, retrying with runs of whitespace collapsed ('Tinder Girls  ')."""
+    return resolve_user(team) or resolve_user(' '.join(team.split()))
+
+def load_teams(path, year, resolve_user):
+    fieldnames, rows = read_rows(path)
+    if not fieldnames:
+        return []
+    team_col = find_column(fieldnames, exact=['team', 'team name', 'name'], default=fieldnames[0])
+    username_col = find_column(fieldnames, exact=['username'])
+    record_col = find_column(fieldnames, contains=['record'])
+    pf_col = find_column(fieldnames, exact=['pf'], contains=['points for', 'points scored'])
+    pa_col = find_column(fieldnames, exact=['pa'], contains=['points against'])
+    teams = []
+    for row in rows:
+        team = (row.get(team_col) or '').strip()
+        if not team:
+            continue
+        wins, losses, ties = parse_record(row.get(record_col) or '' if record_col else '')
+        teams.append(TeamSeason(
+            year, team,
+            (row.get(username_col) or '').strip() if username_col else '',
+            resolve_user(team),
+            wins, losses, ties,
+            parse_float(row.get(pf_col)) if pf_col else 0.0,
+            parse_float(row.get(pa_col)) if pa_col else 0.0,
+            parse_int(row.get('Inseason Rank', '')),
+            parse_int(row.get('Final Rank', '')),
+        ))
+    return teams
+
+def load_matchups(path, year, resolve_user):
+    fieldnames, rows = read_rows(path)
+    # Freshly imported pages carry the game type in the Misc column
+    game_type_col = 'Game_Type' if 'Game_Type' in fieldnames else 'Misc'
+    return [
+        Matchup(
+            year, parse_week(row.get('Week', '')),
+            row.get('Team', ''), resolve_user(row.get('Team', '')), parse_float(row.get('Score_2')),
+            row.get('Opponent', ''), resolve_user(row.get('Opponent', '')), parse_float(row.get('Score')),
+            row.get(game_type_col) or '',
+        )
+        for row in rows
+    ]
+
+def load_transactions(path, year, resolve_user):
+    _, rows = read_rows(path)
+    transactions = []
+    for row in rows:
+        team, _, partner = row.get('Team', '').partition(TEAM_SEPARATOR)
+        transactions.append(Transaction(
+            year, parse_week(row.get('Transaction At', '')), row.get('Type', ''),
+            team, resolve_spaced(resolve_user, team),
+            row.get('Transaction', ''), parse_float(row.get('FAAB')),
+            partner, resolve_spaced(resolve_user, partner) if partner else None,
+        ))
+    return transactions
+
+def load_draft(path, year, resolve_user):
+    _, rows = read_rows(path)
+    picks = []
+    for row in rows:
+        round_number, round_pick, overall = parse_pick(row.get('Pick', ''))
+        picks.append(DraftPick(
+            year, round_number, round_pick, overall, row.get('Player', ''),
+            row.get('Team', ''), resolve_spaced(resolve_user, row.get('Team', '')), row.get('Keeper', ''),
+        ))
+    return picks
+
+LOADERS = {
+    'teams': load_teams,
+    'matchups': load_matchups,
+    'transactions': load_transactions,
+    'draft': load_draft,
+}
+
+def load_season(year_path, year, resolve_user, kinds=None):
+    season = Season(year)
+    for kind in kinds or LOADERS:
+        path = season_file(year_path, kind)
+        if path:
+            with profiling.stage(f'load:{kind}', path) as timing:
+                records = LOADERS[kind](path, year, resolve_user)
+                timing.rows = len(records)
+            setattr(season, kind, records)
+    return season
+
+def load_league(csv_root='csv', map_path='team_user_map.json', kinds=None):
+    """Read every csv_root/<year>/ directory once into typed records."""
+    resolve_user = load_team_resolver(map_path)
+    seasons = {}
+    for year_dir in sorted(os.listdir(csv_root)):
+        year_path = os.path.join(csv_root, year_dir)
+        if os.path.isdir(year_path) and year_dir.isdigit():
+            seasons[year_dir] = load_season(year_path, year_dir, resolve_user, kinds)
+    return League(seasons, resolve_user)
@@ -0,0 +1,240 @@
+import argparse
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from head_to_head import build_head_to_head
+from league_arrays import ColumnarLeague
+from league_data import League, load_season
+from playoff_odds import SeasonModel, simulate
+from playoff_records import compile_league_stats as compile_playoff_stats
+from team_map import load_team_resolver
+
+# Seconds between checks of csv/ and the team map for changes
+CHECK_INTERVAL = 1.0
+# Dependency recorded by results computed over every season, or every season up
+# to one: adding or removing any season directory invalidates them
+SEASON_SET = '*'
+
+class LeagueService:
+    """The league held in memory, with an LRU cache of query results.
+
+    Each cached result remembers which seasons it was computed from. When
+    files under a season directory change, only that season is reloaded and
+    only results depending on it are dropped; a season directory appearing or
+    disappearing also drops results computed over the whole season set. A
+    changed team map reloads everything, since it can change any user
+    resolution.
+
+    Queries are computed outside the lock, against the seasons loaded when
+    they started; a result is only cached if nothing was reloaded meanwhile.
+    """
+
+    def __init__(self, csv_root='csv', map_path='team_user_map.json', cache_size=256):
+        self.csv_root = csv_root
+        self.map_path = map_path
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.lock = threading.RLock()
+        self.seasons = {}
+        self.signatures = {}
+        self.map_signature = None
+        self.last_check = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+        self.refresh(force=True)
+
+    def file_signature(self, path):
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def season_signature(self, year_path):
+        return tuple(sorted((name, self.file_signature(os.path.join(year_path, name)))
+                            for name in os.listdir(year_path) if name.endswith('.csv')))
+
+    def refresh(self, force=False):
+        """Reload whatever changed on disk since the last check, returning the changed seasons."""
+        with self.lock:
+            now = time.monotonic()
+            if not force and now - self.last_check < CHECK_INTERVAL:
+                return set()
+            self.last_check = now
+            map_signature = self.file_signature(self.map_path)
+            if map_signature != self.map_signature:
+                self.map_signature = map_signature
+                self.resolve_user = load_team_resolver(self.map_path)
+                self.signatures = {}
+            current = {}
+            for year_dir in sorted(os.listdir(self.csv_root)):
+                year_path = os.path.join(self.csv_root, year_dir)
+                if os.path.isdir(year_path) and year_dir.isdigit():
+                    current[year_dir] = self.season_signature(year_path)
+            changed = {year for year in current.keys() | self.signatures.keys()
+                       if current.get(year) != self.signatures.get(year)}
+            for year in sorted(changed):
+                if year in current:
+                    self.seasons[year] = load_season(os.path.join(self.csv_root, year), year, self.resolve_user)
+                else:
+                    self.seasons.pop(year, None)
+            self.seasons = dict(sorted(self.seasons.items()))
+            stale = set(changed)
+            if current.keys() != self.signatures.keys():
+                stale.add(SEASON_SET)
+            self.signatures = current
+            if changed:
+                self.generation += 1
+                for key in [key for key, (deps, _) in self.cache.items() if deps & stale]:
+                    del self.cache[key]
+            return changed
+
+
+    def query(self, name, params):
+        self.refresh()
+        handler = QUERIES.get(name)
+        if handler is None:
+            raise KeyError(name)
+        season = params.get('season')
+        key = (name, tuple(sorted(params.items())))
+        with self.lock:
+            if season is not None and season not in self.seasons:
+                raise ValueError(f"unknown season {season}")
+            if key in self.cache:
+                self.hits += 1
+                self.cache.move_to_end(key)
+                return self.cache[key][1]
+            self.misses += 1
+            if season and name in HISTORY_QUERIES:
+                seasons = [year for year in self.seasons if year <= season]
+                deps = frozenset(seasons) | {SEASON_SET}
+            elif season:
+                seasons = [season]
+                deps = frozenset(seasons)
+            else:
+                seasons = list(self.seasons)
+                deps = frozenset(seasons) | {SEASON_SET}
+            # Season objects are replaced, never mutated, on reload, so this snapshot stays consistent
+            league = League({year: self.seasons[year] for year in seasons}, self.resolve_user)
+            generation = self.generation
+        result = handler(league, params)
+        with self.lock:
+            if self.generation == generation:
+                self.cache[key] = (deps, result)
+                if len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+        return result
+
+def standings(league, params):
+    stats = ColumnarLeague(league).regular_season_stats()
+    rows = [{'user': user, **{k: round(v, 2) for k, v in s.items()}} for user, s in stats.items()]
+    return sorted(rows, key=lambda r: r['pf'], reverse=True)
+
+def playoffs(league, params):
+    stats = compile_playoff_stats(league=league)
+    rows = [{'user': user, **{k: round(v, 2) for k, v in s.items()}} for user, s in stats.items()]
+    return sorted(rows, key=lambda r: r['playoff_wins'], reverse=True)
+
+def head_to_head(league, params):
+    h2h = build_head_to_head(league=league)
+    user, opponent = params.get('user'), params.get('opponent')
+    if not user or not opponent:
+        raise ValueError("head_to_head needs user and opponent")
+    if user not in h2h.index or opponent not in h2h.index:
+        return {'user': user, 'opponent': opponent, 'games': 0}
+    record = h2h.record(user, opponent)
+    return {'user': user, 'opponent': opponent,
+            **{k: round(float(v), 2) if k.startswith('points') else int(v) for k, v in record.items()}}
+
+def draft(league, params):
+    user = params.get('user')
+    return [
+        {'season': p.season, 'round': p.round, 'pick': p.pick, 'overall': p.overall,
+         'player': p.player, 'team': p.team, 'user': p.user}
+        for p in league.draft_picks() if not user or p.user == user
+    ]
+
+def odds(league, params):
+    season = params.get('season')
+    if not season:
+        raise ValueError("odds needs a season")
+    try:
+        through_week = int(params['week']) if 'week' in params else None
+        sims = int(params.get('sims', 20000))
+    except ValueError:
+        raise ValueError("week and sims must be integers")
+    if not 1 <= sims <= MAX_SIMS:
+        raise ValueError(f"sims must be between 1 and {MAX_SIMS}")
+    # Simulate in this process: forking a worker pool from a threaded server is not safe
+    return simulate(SeasonModel(league, season, through_week), sims, workers=1)
+
+# Upper bound on simulated seasons per odds request, so one request cannot tie up a server thread
+MAX_SIMS = 100000
+
+# Queries whose season parameter also needs every earlier season loaded
+HISTORY_QUERIES = {'odds'}
+
+QUERIES = {
+    'standings': standings,
+    'playoffs': playoffs,
+    'head_to_head': head_to_head,
+    'draft': draft,
+    'odds': odds,
+}
+
+def make_handler(service):
+    class LeagueHandler(BaseHTTPRequestHandler):
+        def send_json(self, status, body):
+            payload = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            name = url.path.strip('/')
+            params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            if name == 'status':
+                self.send_json(200, {'seasons': list(service.seasons), 'cached': len(service.cache),
+                                     'hits': service.hits, 'misses': service.misses})
+                return
+            if name not in QUERIES:
+                self.send_json(404, {'error': f"unknown query '{name}'", 'queries': sorted(QUERIES)})
+                return
+            try:
+                self.send_json(200, service.query(name, params))
+            except ValueError as e:
+                self.send_json(400, {'error': str(e)})
+            except Exception as e:
+                self.send_json(500, {'error': f"{type(e).__name__}: {e}"})
+
+        def log_message(self, format, *args):
+            pass
+
+    return LeagueHandler
+
+def serve(host='127.0.0.1', port=8765, csv_root='csv', map_path='team_user_map.json'):
+    service = LeagueService(csv_root, map_path)
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    print(f"Serving {len(service.seasons)} seasons on http://{host}:{port}/ ({', '.join(sorted(QUERIES))})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve league queries from memory over HTTP.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--csv-root', default='csv')
+    parser.add_argument('--map', default='team_user_map.json')
+    args = parser.parse_args()
+    serve(args.host, args.port, args.csv_root, args.map)
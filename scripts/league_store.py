@@ -0,0 +1,101 @@
+import os
+import sqlite3
+import sys
+
+from league_data import DraftPick, League, Matchup, Season, TeamSeason, Transaction, load_league
+from team_map import TeamResolver, load_team_user_map
+
+# Bump when the schema changes so stale stores are rebuilt instead of misread
+STORE_VERSION = 2
+
+SCHEMA = '''
+CREATE TABLE team_users (team TEXT PRIMARY KEY, user TEXT NOT NULL, position INTEGER NOT NULL);
+CREATE TABLE teams (
+    season TEXT NOT NULL, team TEXT NOT NULL, username TEXT, user TEXT,
+    wins INTEGER, losses INTEGER, ties INTEGER, points_for REAL, points_against REAL,
+    inseason_rank INTEGER, final_rank INTEGER
+);
+CREATE TABLE matchups (
+    season TEXT NOT NULL, week INTEGER, team TEXT, team_user TEXT, team_score REAL,
+    opponent TEXT, opponent_user TEXT, opponent_score REAL, game_type TEXT
+);
+CREATE TABLE transactions (
+    season TEXT NOT NULL, week INTEGER, type TEXT, team TEXT, user TEXT, transaction_text TEXT, faab REAL,
+    partner TEXT, partner_user TEXT
+);
+CREATE TABLE draft (
+    season TEXT NOT NULL, round INTEGER, pick INTEGER, overall INTEGER,
+    player TEXT, team TEXT, user TEXT, keeper TEXT
+);
+CREATE INDEX teams_season_user ON teams (season, user);
+CREATE INDEX teams_user ON teams (user);
+CREATE INDEX matchups_season_user_week ON matchups (season, team_user, week);
+CREATE INDEX matchups_opponent ON matchups (opponent_user, season, week);
+CREATE INDEX transactions_season_user_week ON transactions (season, user, week);
+CREATE INDEX draft_season_user ON draft (season, user);
+'''
+
+def build_store(csv_root='csv', map_path='team_user_map.json', db_path='league.db'):
+    """Compile every season under csv_root into one indexed SQLite database."""
+    league = load_league(csv_root, map_path)
+    tmp_path = db_path + '.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    with conn:
+        conn.executescript(SCHEMA)
+        conn.execute(f'PRAGMA user_version = {STORE_VERSION}')
+        conn.executemany('INSERT INTO team_users VALUES (?, ?, ?)',
+                         ((team, user, i) for i, (team, user) in enumerate(load_team_user_map(map_path).items())))
+        conn.executemany('INSERT INTO teams VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', (
+            (r.season, r.team, r.username, r.user, r.wins, r.losses, r.ties,
+             r.points_for, r.points_against, r.inseason_rank, r.final_rank)
+            for r in league.team_seasons()))
+        conn.executemany('INSERT INTO matchups VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', (
+            (m.season, m.week, m.team, m.team_user, m.team_score,
+             m.opponent, m.opponent_user, m.opponent_score, m.game_type)
+            for m in league.matchups()))
+        conn.executemany('INSERT INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', (
+            (t.season, t.week, t.type, t.team, t.user, t.transaction, t.faab, t.partner, t.partner_user)
+            for t in league.transactions()))
+        conn.executemany('INSERT INTO draft VALUES (?, ?, ?, ?, ?, ?, ?, ?)', (
+            (d.season, d.round, d.pick, d.overall, d.player, d.team, d.user, d.keeper)
+            for d in league.draft_picks()))
+    conn.close()
+    os.replace(tmp_path, db_path)
+    print(f"League store written to {db_path} ({len(league.seasons)} seasons)")
+    return db_path
+
+def connect(db_path='league.db'):
+    """Open a store read-only, refusing stores written by another schema version."""
+    conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+    version = conn.execute('PRAGMA user_version').fetchone()[0]
+    if version != STORE_VERSION:
+        conn.close()
+        raise ValueError(f"{db_path} has store version {version}, expected {STORE_VERSION}; rebuild it")
+    return conn
+
+def open_league(db_path='league.db'):
+    """Load a League from the store, ready to pass to any report."""
+    conn = connect(db_path)
+    try:
+        team_to_user = dict(conn.execute('SELECT team, user FROM team_users ORDER BY position'))
+        seasons = {}
+        def season(year):
+            if year not in seasons:
+                seasons[year] = Season(year)
+            return seasons[year]
+        for row in conn.execute('SELECT * FROM teams ORDER BY season, rowid'):
+            season(row[0]).teams.append(TeamSeason(*row))
+        for row in conn.execute('SELECT * FROM matchups ORDER BY season, rowid'):
+            season(row[0]).matchups.append(Matchup(*row))
+        for row in conn.execute('SELECT * FROM transactions ORDER BY season, rowid'):
+            season(row[0]).transactions.append(Transaction(*row))
+        for row in conn.execute('SELECT * FROM draft ORDER BY season, rowid'):
+            season(row[0]).draft.append(DraftPick(*row))
+    finally:
+        conn.close()
+    return League(dict(sorted(seasons.items())), TeamResolver(team_to_user))
+
+if __name__ == '__main__':
+    build_store(*sys.argv[1:4])
@@ -0,0 +1,150 @@
+import argparse
+import csv
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import profiling
+from compile_league_stats import write_league_stats
+from import_seasons import default_workers, import_seasons
+from playoff_records import write_playoff_stats
+from team_map import load_team_resolver
+from watch import merge_partials, season_partials
+
+# Resolvers built so far in this worker, so a league's map is read once per process
+_resolvers = {}
+
+class LeagueRoot:
+    """One hosted league: its csv/ tree and the team map its names resolve through."""
+
+    __slots__ = ('name', 'root', 'csv_root', 'map_path')
+
+    def __init__(self, root, name=None, csv_root=None, map_path=None):
+        self.root = root
+        self.name = name or os.path.basename(os.path.abspath(root))
+        self.csv_root = csv_root or os.path.join(root, 'csv')
+        self.map_path = map_path or os.path.join(root, 'team_user_map.json')
+
+def find_league_roots(paths):
+    """Expand each path to league roots: a directory with a team_user_map.json is a league,
+    otherwise every subdirectory that has one is."""
+    roots = []
+    for path in paths:
+        if os.path.isfile(os.path.join(path, 'team_user_map.json')):
+            roots.append(LeagueRoot(path))
+            continue
+        for name in sorted(os.listdir(path)):
+            child = os.path.join(path, name)
+            if os.path.isfile(os.path.join(child, 'team_user_map.json')):
+                roots.append(LeagueRoot(child))
+    names = [league.name for league in roots]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"league names must be unique: {', '.join(duplicates)}")
+    return roots
+
+def plan_shards(leagues):
+    """One (league name, csv root, map path, year) task per season of every league."""
+    shards = []
+    for league in leagues:
+        if not os.path.isdir(league.csv_root):
+            print(f"⚠️  {league.name}: no {league.csv_root}, skipping")
+            continue
+        for year in sorted(os.listdir(league.csv_root)):
+            if year.isdigit() and os.path.isdir(os.path.join(league.csv_root, year)):
+                shards.append((league.name, league.csv_root, league.map_path, year))
+    return shards
+
+def map_shard(name, csv_root, map_path, year):
+    """Worker side: one season's regular-season and playoff partials."""
+    if map_path not in _resolvers:
+        _resolvers[map_path] = load_team_resolver(map_path)
+    with profiling.stage('map:season'):
+        records, playoffs = season_partials(csv_root, year, _resolvers[map_path])
+    return name, year, records, playoffs, profiling.take()
+
+def reduce_league(partials):
+    """Merge {year: stats} partials for each league into all-time stats."""
+    return {name: merge_partials(by_year) for name, by_year in partials.items()}
+
+def aggregate_leagues(leagues, workers=None):
+    """Map every season of every league over a process pool, then reduce per league.
+
+    Returns ({league: records}, {league: playoff stats}).
+    """
+    shards = plan_shards(leagues)
+    records = {league.name: {} for league in leagues}
+    playoffs = {league.name: {} for league in leagues}
+    if not shards:
+        return records, playoffs
+    workers = min(workers or default_workers(), len(shards))
+    with profiling.stage('map'), ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(map_shard, *shard) for shard in shards]
+        for future in as_completed(futures):
+            name, year, season_records, season_playoffs, profile = future.result()
+            profiling.merge(profile)
+            records[name][year] = season_records
+            playoffs[name][year] = season_playoffs
+    with profiling.stage('reduce'):
+        return reduce_league(records), reduce_league(playoffs)
+
+def leaderboard_rows(records, playoffs):
+    """One row per (league, user), ranked by win percentage and then points for."""
+    rows = []
+    for name, users in records.items():
+        for user, stats in users.items():
+            games = stats['wins'] + stats['losses'] + stats['ties']
+            playoff = playoffs.get(name, {}).get(user, {})
+            rows.append([
+                name, user, stats['wins'], stats['losses'], stats['ties'], games,
+                (stats['wins'] + stats['ties'] / 2) / games if games else 0.0,
+                stats['pf'], stats['pa'],
+                playoff.get('playoff_wins', 0), playoff.get('playoff_losses', 0), playoff.get('championships', 0),
+            ])
+    rows.sort(key=lambda r: (r[6], r[7]), reverse=True)
+    return rows
+
+def write_leaderboard(rows, output_csv):
+    with open(output_csv, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Rank', 'League', 'User', 'Wins', 'Losses', 'Ties', 'Games Played', 'Win Pct',
+                         'Points For', 'Points Against', 'Playoff Wins', 'Playoff Losses', 'Championships'])
+        for rank, row in enumerate(rows, 1):
+            writer.writerow([rank, *row[:6], f'{row[6]:.3f}', f'{row[7]:.2f}', f'{row[8]:.2f}', *row[9:]])
+
+# Derived tables stay out of csv/, which build_site_data publishes
+def run_multi_league(paths, output_root='reports/leagues', workers=None, import_first=False):
+    """Aggregate many leagues at once, writing per-league records and a cross-league leaderboard."""
+    leagues = find_league_roots(paths)
+    if import_first:
+        for league in leagues:
+            input_root = os.path.join(league.root, 'input')
+            if os.path.isdir(input_root):
+                import_seasons(input_root, league.csv_root, workers=workers,
+                               manifest_path=os.path.join(league.root, 'import_manifest.json'))
+    records, playoffs = aggregate_leagues(leagues, workers)
+    os.makedirs(output_root, exist_ok=True)
+    for name in records:
+        league_root = os.path.join(output_root, name)
+        os.makedirs(league_root, exist_ok=True)
+        write_league_stats(records[name], os.path.join(league_root, 'records.csv'))
+        write_playoff_stats(playoffs[name], os.path.join(league_root, 'playoff_records.csv'))
+    leaderboard_csv = os.path.join(output_root, 'leaderboard.csv')
+    write_leaderboard(leaderboard_rows(records, playoffs), leaderboard_csv)
+    print(f"Aggregated {len(leagues)} leagues, leaderboard written to {leaderboard_csv}")
+    return records, playoffs
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Aggregate records for many leagues in parallel.')
+    parser.add_argument('roots', nargs='+',
+                        help='league directories (csv/ plus team_user_map.json), or directories of them')
+    parser.add_argument('--output-root', default='reports/leagues')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--import', dest='import_first', action='store_true',
+                        help='import each league\'s input/ pages before aggregating')
+    args = parser.parse_args()
+    try:
+        run_multi_league(args.roots, args.output_root, args.workers, args.import_first)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
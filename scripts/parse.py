@@ -1,14 +1,130 @@
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
 import csv
+import re
 import sys
 import os
 from collections import Counter
-from typing import List, Tuple
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, Tuple
+
+import profiling
+from league_data import TEAM_SEPARATOR
+
+# Bump when a change to the extraction logic alters the CSV output, so cached
+# conversions made by an older version are rebuilt.
+PARSER_VERSION = "4"
+
+# Tree builders tried in order when no parser is requested. lxml is a compiled
+# backend and much faster on the large draft/transaction exports; html.parser
+# is always available and kept as the fallback.
+PARSER_BACKENDS = ["lxml", "html.parser"]
+FALLBACK_PARSER = "html.parser"
+
+def available_parsers() -> List[str]:
+    """Return the parser backends that can be used in this environment."""
+    available = []
+    for name in PARSER_BACKENDS:
+        if name == FALLBACK_PARSER:
+            available.append(name)
+            continue
+        try:
+            __import__(name)
+        except ImportError:
+            continue
+        available.append(name)
+    return available
+
+@profiling.counted
+def make_soup(html_content: str, parser: str = None) -> BeautifulSoup:
+    """Build a soup with the requested parser backend, falling back to html.parser."""
+    if parser is None:
+        parser = available_parsers()[0]
+    elif parser not in available_parsers():
+        print(f"⚠️  Parser '{parser}' is not available, using {FALLBACK_PARSER}.")
+        parser = FALLBACK_PARSER
+    return BeautifulSoup(html_content, parser)
+
+# Headers that identify the table to convert for each kind of export page.
+TABLE_SIGNATURES = {
+    "draft": ["Pick", "Player"],
+    "matchups": ["Week", "Opponent"],
+    "teams": ["Record"],
+    "transactions": ["Transaction"],
+}
+
+# Where the export page and the CSVs the loaders read disagree. The team cell
+# stacks the username under the team name, matchups call Game_Type "Misc", and a
+# trade shows only as an icon in Type with both teams stacked in the Team cell.
+MEMBER_HEADER = "Team/Member"
+USERNAME_HEADER = "Username"
+USERNAME_CLASS = "text-gray-400"
+TEAM_NAME_CLASS = "text-xs"
+TRADE_CLASS = "bg-amber-500"
+TRADE_TYPE = "Trade"
+RENAMED_HEADERS = {"matchups": {"Misc": "Game_Type"}}
+
+def split_member_cell(cell) -> List[str]:
+    """Split a Team/Member cell into the team name and the username shown beneath it."""
+    username = cell.find("span", class_=USERNAME_CLASS)
+    if username is None:
+        return [extract_cell_content(cell), ""]
+    team = username.find_previous_sibling("span")
+    return [sanitize_ascii(team.get_text(strip=True)) if team else "", sanitize_ascii(username.get_text(strip=True))]
+
+def transaction_type_cell(cell) -> List[str]:
+    """Write 'Trade' for the trade icon; other types have no text on the page."""
+    if cell.find(class_=TRADE_CLASS) is not None:
+        return [TRADE_TYPE]
+    return [extract_cell_content(cell)]
+
+def transaction_team_cell(cell) -> List[str]:
+    """Keep the two teams of a trade apart instead of running their names together."""
+    # Drops that go with a trade can list the same team twice
+    teams = list(dict.fromkeys(sanitize_ascii(span.get_text(strip=True))
+                               for span in cell.find_all("span", class_=TEAM_NAME_CLASS)))
+    if teams:
+        return [TEAM_SEPARATOR.join(teams)]
+    return [extract_cell_content(cell)]
+
+# Cells that need more than their text, by kind and export header
+CELL_CONVERTERS = {
+    "teams": {MEMBER_HEADER: split_member_cell},
+    "transactions": {"Type": transaction_type_cell, "Team": transaction_team_cell},
+}
+
+def conform_headers(headers: List[str], kind: str = None) -> Tuple[List[str], Dict[int, Callable]]:
+    """Return the CSV headers for a kind of page, and the cell converters keyed by the column they write first."""
+    if kind is None:
+        return headers, {}
+    renames = RENAMED_HEADERS.get(kind, {})
+    converters = CELL_CONVERTERS.get(kind, {})
+    conformed = []
+    columns = {}
+    for header in headers:
+        if header == MEMBER_HEADER and USERNAME_HEADER in headers:
+            # Already split, as in the hand-kept CSVs
+            conformed.append(header)
+            continue
+        if header in converters:
+            columns[len(conformed)] = converters[header]
+        conformed.append(renames.get(header, header))
+        if header == MEMBER_HEADER and kind == "teams":
+            conformed.append(USERNAME_HEADER)
+    return conformed, columns
 
 def find_all_tables(soup: BeautifulSoup) -> List[BeautifulSoup]:
     """Find all tables in the HTML document."""
     return soup.find_all("table")
 
+def select_table(tables: List[BeautifulSoup], kind: str) -> BeautifulSoup:
+    """Return the first table whose headers match the signature for this kind of page."""
+    signature = TABLE_SIGNATURES[kind]
+    for table in tables:
+        headers = extract_headers(table)
+        if all(header in headers for header in signature):
+            return table
+    return None
+
 def parse_svg_icon(element) -> str:
     """
     Parse element to determine if it contains a plus or minus SVG icon.
@@ -30,50 +146,62 @@ def parse_svg_icon(element) -> str:
     
     return ""
 
+WHITESPACE = re.compile(r'\s+')
+
+@profiling.counted
 def sanitize_ascii(text):
     """Remove or replace non-ASCII characters in text and collapse multiple spaces."""
-    import re
     ascii_text = ''.join(c if ord(c) < 128 else ' ' for c in text)
-    return re.sub(r'\s+', ' ', ascii_text).strip()
+    return WHITESPACE.sub(' ', ascii_text).strip()
+
+# Add/drop marker classes and the prefix they produce, checked in this order.
+PLAYER_MARKERS = (("bg-red-300", "(-)"), ("bg-green-300", "(+)"))
+
+def marker_prefix(element) -> str:
+    """Return the add/drop prefix for a marker element, or None if it is not one."""
+    classes = element.get('class') or ()
+    for marker_class, prefix in PLAYER_MARKERS:
+        if marker_class in classes:
+            return prefix
+    return None
+
+@profiling.counted
+def marker_player_name(marker) -> str:
+    """Find the player name shown next to an add/drop marker."""
+    # Climb to the flex row parent, remembering which of its children holds the marker
+    child = marker
+    flex_row = marker.parent
+    while flex_row is not None and 'flex' not in (flex_row.get('class') or ()):
+        child = flex_row
+        flex_row = flex_row.parent
+    if flex_row is None or child.name != 'div':
+        return ''
+    # The colored div is in one child, the player name is in the next sibling div
+    name_div = child.find_next_sibling('div')
+    if name_div is None:
+        return ''
+    # Get the innermost div's text
+    inner_div = name_div.find('div')
+    if inner_div:
+        return inner_div.get_text(strip=True)
+    return name_div.get_text(strip=True)
 
+@profiling.counted
 def extract_cell_content(cell) -> str:
     """Extract content from a cell, handling special cases like SVG icons and wrapping divs for each player."""
-    from bs4 import Tag
-    player_divs = cell.select('.bg-red-300, .bg-green-300')
-    if player_divs:
-        players = []
-        for div in player_divs:
-            # Go up to the flex row parent
-            flex_row = div.find_parent(class_='flex')
-            player_name = ''
-            if flex_row:
-                # Find all direct children divs of the flex row
-                children = [c for c in flex_row.children if isinstance(c, Tag) and c.name == 'div']
-                # The colored div is in one child, the player name is in the other
-                for child in children:
-                    if div in child.descendants:
-                        # The next sibling div should have the player name
-                        idx = children.index(child)
-                        if idx + 1 < len(children):
-                            name_div = children[idx + 1]
-                            # Get the innermost div's text
-                            inner_div = name_div.find('div')
-                            if inner_div:
-                                player_name = inner_div.get_text(strip=True)
-                            else:
-                                player_name = name_div.get_text(strip=True)
-                        break
-            classes = div.get('class', [])
-            if 'bg-red-300' in classes:
-                players.append(sanitize_ascii(f"(-) {player_name}"))
-            elif 'bg-green-300' in classes:
-                players.append(sanitize_ascii(f"(+) {player_name}"))
-            else:
-                players.append(sanitize_ascii(player_name))
+    players = []
+    for element in cell.descendants:
+        if not isinstance(element, Tag):
+            continue
+        prefix = marker_prefix(element)
+        if prefix is not None:
+            players.append(sanitize_ascii(f"{prefix} {marker_player_name(element)}"))
+    if players:
         return ', '.join(players)
     # Otherwise, get text content as before
     return sanitize_ascii(cell.get_text(strip=True).replace("\n", " "))
 
+@profiling.counted
 def extract_headers(table: BeautifulSoup) -> List[str]:
     """Extract headers from a table, handling both th and td in thead/tr."""
     headers = []
@@ -119,10 +247,39 @@ def parse_svg_icon(svg_element) -> str:
         return '-'
     return ""
 
-def extract_rows(table: BeautifulSoup, header_count: int) -> List[List[str]]:
-    """Extract rows from table body, handling various table structures."""
-    rows = []
+@profiling.counted
+def extract_row(tr, header_count: int, converters: Dict[int, Callable] = None) -> List[str]:
+    """Extract one row's cell values, padded or trimmed to the header count.
+
+    A cell starting at a column in converters is converted by that function
+    instead, which returns the values it writes (see conform_headers).
+    """
+    row = []
+    cells = tr.find_all(["td", "th"])  # Include both td and th cells
     
+    # Process each cell
+    for cell in cells:
+        if converters and len(row) in converters:
+            row.extend(converters[len(row)](cell))
+            continue
+        # Handle colspan
+        colspan = int(cell.get('colspan', 1))
+        content = extract_cell_content(cell)
+        
+        # Add the cell value colspan times
+        for _ in range(colspan):
+            row.append(content)
+    
+    # Ensure row matches header count
+    if len(row) < header_count:
+        row.extend([''] * (header_count - len(row)))
+    elif len(row) > header_count:
+        row = row[:header_count]
+    
+    return row
+
+def extract_rows(table: BeautifulSoup, header_count: int, converters: Dict[int, Callable] = None) -> List[List[str]]:
+    """Extract rows from table body, handling various table structures."""
     # Try to find tbody first
     tbody = table.find("tbody")
     if tbody:
@@ -131,44 +288,192 @@ def extract_rows(table: BeautifulSoup, header_count: int) -> List[List[str]]:
         # If no tbody, use all tr elements except the first one (assumed header)
         row_elements = table.find_all("tr")[1:]
     
-    for tr in row_elements:
-        row = []
-        cells = tr.find_all(["td", "th"])  # Include both td and th cells
-        
-        # Process each cell
-        for cell in cells:
-            # Handle colspan
-            colspan = int(cell.get('colspan', 1))
-            content = extract_cell_content(cell)
-            
-            # Add the cell value colspan times
-            for _ in range(colspan):
-                row.append(content)
-        
-        # Ensure row matches header count
-        if len(row) < header_count:
-            row.extend([''] * (header_count - len(row)))
-        elif len(row) > header_count:
-            row = row[:header_count]
-        
-        rows.append(row)
-    
-    return rows
+    return [extract_row(tr, header_count, converters) for tr in row_elements]
+
+# Characters of the page fed to the tokenizer at a time when streaming
+STREAM_CHUNK_SIZE = 1 << 16
+
+class TableRowTokenizer(HTMLParser):
+    """Push tokenizer that cuts each top-level table row out of the page as HTML.
+
+    Fed the page a chunk at a time, it keeps only the unparsed tail of the
+    input and the row being read. Each finished event lands in `events`:
+    ("start", ...) and ("end", ...) for a top-level table, and ("row", html,
+    in_tbody, seen_tbody) for one of its rows, nested tables included.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.table_depth = 0
+        self.in_tbody = False
+        self.seen_tbody = False
+        self.row = None  # raw HTML of the row being read
+        self.events = []
+
+    def end_row(self):
+        self.events.append(("row", "".join(self.row), self.in_tbody, self.seen_tbody))
+        self.row = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "table":
+            self.table_depth += 1
+            if self.table_depth == 1:
+                self.in_tbody = self.seen_tbody = False
+                self.events.append(("start", None, False, False))
+        elif tag == "tbody" and self.table_depth == 1:
+            self.in_tbody = self.seen_tbody = True
+        elif tag == "tr" and self.table_depth == 1:
+            if self.row is not None:
+                # An unclosed row ends where the next one starts
+                self.end_row()
+            self.row = []
+        if self.row is not None:
+            self.row.append(self.get_starttag_text())
+
+    def handle_startendtag(self, tag, attrs):
+        if self.row is not None:
+            self.row.append(self.get_starttag_text())
+
+    def handle_endtag(self, tag):
+        if tag == "table" and self.table_depth:
+            if self.table_depth == 1:
+                if self.row is not None:
+                    self.end_row()
+                self.events.append(("end", None, False, False))
+            self.table_depth -= 1
+        if self.row is not None:
+            self.row.append(f"</{tag}>")
+            if tag == "tr" and self.table_depth == 1:
+                self.end_row()
+        if tag == "tbody" and self.table_depth == 1:
+            self.in_tbody = False
+
+    def handle_data(self, data):
+        if self.row is not None:
+            self.row.append(data)
+
+    def handle_entityref(self, name):
+        self.handle_data(f"&{name};")
+
+    def handle_charref(self, name):
+        self.handle_data(f"&#{name};")
 
-def process_html_table(input_file: str, output_file: str) -> None:
-    """Process HTML file and convert table to CSV."""
+    def handle_comment(self, data):
+        self.handle_data(f"<!--{data}-->")
+
+def table_events(input_file: str):
+    """Yield the tokenizer events for a page, reading it a chunk at a time."""
+    tokenizer = TableRowTokenizer()
     with open(input_file, "r", encoding="utf-8") as file:
+        while True:
+            chunk = file.read(STREAM_CHUNK_SIZE)
+            if chunk:
+                tokenizer.feed(chunk)
+            else:
+                tokenizer.close()
+            yield from tokenizer.events
+            tokenizer.events.clear()
+            if not chunk:
+                return
+
+def stream_table_rows(input_file: str, kind: str = None):
+    """Yield the headers, then each row, of the first matching table without building the whole tree.
+
+    The page is fed a chunk at a time to an html.parser tokenizer that holds
+    only the row being read (see TableRowTokenizer). Every finished <tr> is
+    converted on its own and dropped, so memory stays flat however large the
+    export is. The first table whose headers match the signature for `kind`
+    is used, or the first table if no kind is given. Headers and rows are
+    conformed to the kind's CSV layout (see conform_headers).
+    """
+    target = False  # inside the table being converted
+    seen_header = False
+    header_count = 0
+    converters = {}
+    for event, html, in_tbody, seen_tbody in table_events(input_file):
+        if event == "start":
+            seen_header = False
+            continue
+        if event == "end":
+            if target:
+                return
+            continue
+        row = BeautifulSoup(html, FALLBACK_PARSER)
+        if not seen_header:
+            # The header row: the first tr, whether or not it sits in a thead
+            seen_header = True
+            headers = extract_headers(row)
+            target = kind is None or all(header in headers for header in TABLE_SIGNATURES[kind])
+            if target:
+                headers, converters = conform_headers(headers, kind)
+                header_count = len(headers)
+                yield headers
+                if in_tbody:
+                    yield extract_row(row, header_count, converters)
+        elif target and (in_tbody or not seen_tbody):
+            yield extract_row(row, header_count, converters)
+
+def stream_html_table(input_file: str, output_file: str, kind: str = None) -> int:
+    """Convert a table to CSV row by row with bounded memory. Returns the row count."""
+    rows = stream_table_rows(input_file, kind)
+    headers = next(rows, None)
+    if not headers:
+        print("❌ No matching table with headers found in the HTML.")
+        sys.exit(1)
+
+    # Create output directory if it doesn't exist
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+
+    # Write to a temporary file so a failed run never leaves a partial CSV behind
+    tmp_file = output_file + ".tmp"
+    count = 0
+    with open(tmp_file, "w", newline='', encoding="utf-8") as csvfile, profiling.stage("stream_rows") as timing:
+        writer = csv.writer(csvfile)
+        writer.writerow(headers)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+        timing.rows = count
+    if not count:
+        os.remove(tmp_file)
+        print("❌ No data rows found in the table.")
+        sys.exit(1)
+    os.replace(tmp_file, output_file)
+
+    print(f"✅ CSV file '{output_file}' created successfully.")
+    print(f"   - {len(headers)} columns")
+    print(f"   - {count} rows")
+    return count
+
+def process_html_table(input_file: str, output_file: str, parser: str = None, kind: str = None,
+                       stream: bool = False) -> int:
+    """Process HTML file and convert table to CSV.
+
+    When kind is given the table is picked by its header signature instead of
+    prompting, so the conversion can run unattended, and the columns are
+    conformed to the layout the loaders read. With stream=True the
+    rows are extracted one at a time (see stream_html_table). Returns the row count.
+    """
+    if stream:
+        return stream_html_table(input_file, output_file, kind)
+    with open(input_file, "r", encoding="utf-8") as file, profiling.stage("read_html"):
         html_content = file.read()
 
-    soup = BeautifulSoup(html_content, "html.parser")
+    with profiling.stage("soup"):
+        soup = make_soup(html_content, parser)
     tables = find_all_tables(soup)
 
     if not tables:
         print("❌ No tables found in the HTML.")
         sys.exit(1)
 
+    if kind is not None:
+        table = select_table(tables, kind)
+        if table is None:
+            print(f"❌ No table matching the {kind} headers: {', '.join(TABLE_SIGNATURES[kind])}")
+            sys.exit(1)
     # If multiple tables found, ask user which one to process
-    if len(tables) > 1:
+    elif len(tables) > 1:
         print(f"Found {len(tables)} tables in the HTML file.")
         print("\nTable previews:")
         for i, table in enumerate(tables, 1):
@@ -195,7 +500,11 @@ def process_html_table(input_file: str, output_file: str) -> None:
         print("❌ No headers found in the table.")
         sys.exit(1)
 
-    rows = extract_rows(table, len(headers))
+    headers, converters = conform_headers(headers, kind)
+
+    with profiling.stage("extract_rows") as timing:
+        rows = extract_rows(table, len(headers), converters)
+        timing.rows = len(rows)
     if not rows:
         print("❌ No data rows found in the table.")
         sys.exit(1)
@@ -204,7 +513,8 @@ def process_html_table(input_file: str, output_file: str) -> None:
     os.makedirs(os.path.dirname(output_file), exist_ok=True)
 
     # Write to CSV
-    with open(output_file, "w", newline='', encoding="utf-8") as csvfile:
+    with open(output_file, "w", newline='', encoding="utf-8") as csvfile, profiling.stage("write_csv") as timing:
+        timing.rows = len(rows)
         writer = csv.writer(csvfile)
         writer.writerow(headers)
         writer.writerows(rows)
@@ -212,17 +522,23 @@ def process_html_table(input_file: str, output_file: str) -> None:
     print(f"✅ CSV file '{output_file}' created successfully.")
     print(f"   - {len(headers)} columns")
     print(f"   - {len(rows)} rows")
+    return len(rows)
 
 def safe_print(text):
     print(''.join(c if ord(c) < 128 else '?' for c in str(text)))
 
 if __name__ == "__main__":
+    stream = "--stream" in sys.argv
+    if stream:
+        sys.argv.remove("--stream")
     if len(sys.argv) < 3:
-        safe_print("Usage: python3 script.py <input_file> <output_file>")
+        safe_print("Usage: python3 script.py <input_file> <output_file> [parser] [--stream]")
         safe_print("Example: python3 script.py input/2019-teams.html csv/2019/teams.csv")
+        safe_print(f"Parsers: {', '.join(PARSER_BACKENDS)} (default: first available)")
         sys.exit(1)
 
     input_file = sys.argv[1]
     output_file = sys.argv[2]
+    parser = sys.argv[3] if len(sys.argv) > 3 else None
     
-    process_html_table(input_file, output_file)
+    process_html_table(input_file, output_file, parser, stream=stream)
@@ -0,0 +1,248 @@
+import argparse
+import csv
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from import_seasons import default_workers
+from league_data import load_league
+
+# Pseudo-games of league-average scoring mixed into each user's fit, so a
+# user with few games is pulled towards the league instead of trusted blindly
+PRIOR_GAMES = 4
+# Seasons simulated per array batch; bounds memory at batch x games floats
+BATCH_SIZE = 10000
+
+def participant(team, user):
+    return user or team
+
+def season_games(season):
+    """Regular-season games as (week, home, away, home score, away score)."""
+    return [(m.week, participant(m.team, m.team_user), participant(m.opponent, m.opponent_user),
+             m.team_score, m.opponent_score)
+            for m in season.matchups if not m.game_type and m.week]
+
+def playoff_field_size(league, year):
+    """Teams that made the playoffs in this season, or in the latest earlier season that has playoffs."""
+    for season_year in sorted((y for y in league.seasons if y <= year), reverse=True):
+        teams = {participant(m.team, m.team_user) for m in league.seasons[season_year].matchups if m.is_playoff}
+        teams |= {participant(m.opponent, m.opponent_user)
+                  for m in league.seasons[season_year].matchups if m.is_playoff}
+        if teams:
+            return len(teams)
+    return 4
+
+def regular_season_weeks(league, year):
+    """Weeks in this season's regular season, taken from the last complete season when it is still running."""
+    for season_year in sorted((y for y in league.seasons if y <= year), reverse=True):
+        season = league.seasons[season_year]
+        if any(m.is_playoff for m in season.matchups):
+            return len({week for week, *_ in season_games(season)})
+    return len({week for week, *_ in season_games(league.seasons[year])})
+
+def bracket_order(size):
+    """Seed numbers in bracket slot order, e.g. 8 -> [1, 8, 4, 5, 2, 7, 3, 6]."""
+    order = [1]
+    while len(order) < size:
+        n = len(order) * 2 + 1
+        order = [seed for s in order for seed in (s, n - s)]
+    return order
+
+class SeasonModel:
+    """Everything a worker needs to simulate the rest of one season, as plain arrays.
+
+    Users are integer ids into `users`. Each user's weekly score is modelled
+    as a normal distribution fitted on their regular-season scores over the
+    last `history` seasons, shrunk towards the league average.
+    """
+
+    def __init__(self, league, year, through_week=None, history=3, playoff_teams=None, regular_weeks=None):
+        year = str(year)
+        season = league.seasons[year]
+        games = season_games(season)
+        if through_week is None:
+            through_week = max((week for week, *_ in games), default=0)
+        self.year = year
+        self.through_week = through_week
+        self.users = sorted({u for _, home, away, _, _ in games for u in (home, away)})
+        index = {user: i for i, user in enumerate(self.users)}
+        n = len(self.users)
+
+        played = [g for g in games if g[0] <= through_week]
+        self.wins = np.zeros(n)
+        self.points_for = np.zeros(n)
+        for _, home, away, home_score, away_score in played:
+            h, a = index[home], index[away]
+            self.wins[h] += 1 if home_score > away_score else 0.5 if home_score == away_score else 0
+            self.wins[a] += 1 if away_score > home_score else 0.5 if home_score == away_score else 0
+            self.points_for[h] += home_score
+            self.points_for[a] += away_score
+        self.games_played = np.zeros(n)
+        for _, home, away, _, _ in played:
+            self.games_played[index[home]] += 1
+            self.games_played[index[away]] += 1
+
+        remaining = [(week, home, away) for week, home, away, _, _ in games if week > through_week]
+        # A mid-season export has no rows for weeks not yet played: repeat the season's pairings
+        weeks = sorted({week for week, *_ in games})
+        total_weeks = regular_weeks or regular_season_weeks(league, year)
+        if weeks and len(weeks) < total_weeks:
+            by_week = {}
+            for week, home, away, _, _ in games:
+                by_week.setdefault(week, []).append((home, away))
+            for i in range(total_weeks - len(weeks)):
+                week = weeks[-1] + 1 + i
+                remaining += [(week, home, away) for home, away in by_week[weeks[i % len(weeks)]]]
+        self.remaining_weeks = sorted({week for week, _, _ in remaining})
+        self.home = np.array([index[home] for _, home, _ in remaining], dtype=np.int32)
+        self.away = np.array([index[away] for _, _, away in remaining], dtype=np.int32)
+
+        self.mean, self.std = self.fit_scores(league, year, history, index)
+        self.playoff_teams = min(playoff_teams or playoff_field_size(league, year), n)
+
+    def fit_scores(self, league, year, history, index):
+        recent = [y for y in sorted(league.seasons) if y <= year][-history:]
+        scores = [[] for _ in self.users]
+        for y in recent:
+            for week, home, away, home_score, away_score in season_games(league.seasons[y]):
+                if y == year and week > self.through_week:
+                    continue
+                if home in index:
+                    scores[index[home]].append(home_score)
+                if away in index:
+                    scores[index[away]].append(away_score)
+        pooled = np.array([s for user_scores in scores for s in user_scores])
+        league_mean = pooled.mean() if len(pooled) else 100.0
+        league_var = pooled.var() if len(pooled) > 1 else 400.0
+        mean = np.empty(len(self.users))
+        std = np.empty(len(self.users))
+        for i, user_scores in enumerate(scores):
+            user_scores = np.array(user_scores)
+            k = len(user_scores)
+            user_mean = user_scores.mean() if k else league_mean
+            user_var = user_scores.var() if k > 1 else league_var
+            mean[i] = (k * user_mean + PRIOR_GAMES * league_mean) / (k + PRIOR_GAMES)
+            std[i] = np.sqrt((k * user_var + PRIOR_GAMES * league_var) / (k + PRIOR_GAMES))
+        return mean, std
+
+def simulate_batch(model, sims, rng):
+    """Simulate `sims` seasons at once; returns per-user counts of berths, byes and titles and total wins."""
+    n = len(model.users)
+    games = len(model.home)
+    # Every remaining regular-season game for every simulated season in one draw
+    home_score = rng.normal(model.mean[model.home], model.std[model.home], size=(sims, games))
+    away_score = rng.normal(model.mean[model.away], model.std[model.away], size=(sims, games))
+    home_won = (home_score > away_score).astype(np.float64)
+    home_onehot = np.zeros((games, n))
+    home_onehot[np.arange(games), model.home] = 1
+    away_onehot = np.zeros((games, n))
+    away_onehot[np.arange(games), model.away] = 1
+    wins = model.wins + home_won @ home_onehot + (1 - home_won) @ away_onehot
+    points_for = model.points_for + home_score @ home_onehot + away_score @ away_onehot
+
+    # Seed by wins, then points for
+    seeds = np.argsort(-(wins * 1e6 + points_for), axis=1, kind='stable')
+    field = seeds[:, :model.playoff_teams]
+    berths = np.bincount(field.ravel(), minlength=n)
+
+    # Single elimination with byes for the top seeds; -1 marks an empty slot
+    size = 1 << (model.playoff_teams - 1).bit_length()
+    order = np.array(bracket_order(size)) - 1
+    slots = np.where(order < model.playoff_teams, field[:, np.minimum(order, model.playoff_teams - 1)], -1)
+    byes = np.bincount(field[:, :size - model.playoff_teams].ravel(), minlength=n)
+    while slots.shape[1] > 1:
+        a, b = slots[:, 0::2], slots[:, 1::2]
+        a_score = rng.normal(model.mean[a], model.std[a])
+        b_score = rng.normal(model.mean[b], model.std[b])
+        slots = np.where((b < 0) | ((a >= 0) & (a_score >= b_score)), a, b)
+    titles = np.bincount(slots[:, 0], minlength=n)
+    return berths, byes, titles, wins.sum(axis=0)
+
+def simulate_chunk(model, sims, seed):
+    rng = np.random.default_rng(seed)
+    n = len(model.users)
+    totals = [np.zeros(n), np.zeros(n), np.zeros(n), np.zeros(n)]
+    done = 0
+    while done < sims:
+        batch = min(BATCH_SIZE, sims - done)
+        for total, counts in zip(totals, simulate_batch(model, batch, rng)):
+            total += counts
+        done += batch
+    return totals
+
+def simulate(model, sims=20000, workers=None, seed=None):
+    """Run `sims` seasons split across worker processes and return one odds row per user."""
+    workers = max(1, min(workers or default_workers(), sims // BATCH_SIZE or 1))
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    chunks = [sims // workers + (i < sims % workers) for i in range(workers)]
+    if workers == 1:
+        results = [simulate_chunk(model, chunks[0], seeds[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(simulate_chunk, [model] * workers, chunks, seeds))
+    berths, byes, titles, wins = (sum(parts) for parts in zip(*results))
+    rows = []
+    for i, user in enumerate(model.users):
+        rows.append({
+            'user': user,
+            'wins': float(model.wins[i]),
+            'games': int(model.games_played[i]),
+            'points_for': round(float(model.points_for[i]), 2),
+            'mean_score': round(float(model.mean[i]), 2),
+            'std_score': round(float(model.std[i]), 2),
+            'projected_wins': round(float(wins[i] / sims), 2),
+            'playoffs': round(float(berths[i] / sims), 4),
+            'bye': round(float(byes[i] / sims), 4),
+            'championship': round(float(titles[i] / sims), 4),
+        })
+    return sorted(rows, key=lambda r: (r['championship'], r['playoffs']), reverse=True)
+
+def playoff_odds(season, csv_root='csv', map_path='team_user_map.json', through_week=None, sims=20000,
+                 workers=None, seed=None, league=None):
+    if league is None:
+        league = load_league(csv_root, map_path, kinds=['matchups'])
+    if str(season) not in league.seasons:
+        raise ValueError(f"unknown season {season}")
+    model = SeasonModel(league, season, through_week)
+    return model, simulate(model, sims, workers, seed)
+
+def print_odds(model, rows, sims):
+    print(f"{model.year} after week {model.through_week}: {sims:,} simulated seasons, "
+          f"{len(model.remaining_weeks)} regular-season weeks left, {model.playoff_teams} playoff teams")
+    print(f"{'User':<14} | {'Record':>7} | {'Proj W':>6} | {'Mean':>6} | {'Playoffs':>8} | {'Bye':>6} | {'Title':>6}")
+    print('-'*70)
+    for r in rows:
+        record = f"{r['wins']:g}-{r['games'] - r['wins']:g}"
+        print(f"{r['user']:<14} | {record:>7} | {r['projected_wins']:>6.2f} | {r['mean_score']:>6.1f} | "
+              f"{r['playoffs']:>8.1%} | {r['bye']:>6.1%} | {r['championship']:>6.1%}")
+
+def write_odds(rows, output_csv):
+    with open(output_csv, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['User', 'Wins', 'Games Played', 'Points For', 'Mean Score', 'Score Std Dev',
+                         'Projected Wins', 'Playoff Odds', 'Bye Odds', 'Championship Odds'])
+        for r in rows:
+            writer.writerow([r['user'], f"{r['wins']:g}", r['games'], f"{r['points_for']:.2f}", r['mean_score'],
+                             r['std_score'], r['projected_wins'], r['playoffs'], r['bye'], r['championship']])
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Simulate the rest of a season for playoff and championship odds.')
+    parser.add_argument('season')
+    parser.add_argument('--through-week', type=int, help='treat later weeks as unplayed (default: every week in the CSV)')
+    parser.add_argument('--sims', type=int, default=20000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--csv-root', default='csv')
+    parser.add_argument('--map', default='team_user_map.json')
+    parser.add_argument('--output', help='also write the odds to this CSV')
+    args = parser.parse_args()
+    try:
+        model, rows = playoff_odds(args.season, args.csv_root, args.map, args.through_week,
+                                   args.sims, args.workers, args.seed)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print_odds(model, rows, args.sims)
+    if args.output:
+        write_odds(rows, args.output)
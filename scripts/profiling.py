@@ -0,0 +1,223 @@
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+try:
+    import resource
+except ImportError:  # POSIX only; peak RSS is reported as None elsewhere
+    resource = None
+
+# Opt-in: LEAGUE_PROFILE=profile.json writes a JSON report when the process
+# exits, LEAGUE_PROFILE=profile.folded writes collapsed stacks for
+# flamegraph.pl or speedscope. Unset, every hook below is a no-op.
+PROFILE_PATH = os.environ.get('LEAGUE_PROFILE')
+ENABLED = bool(PROFILE_PATH)
+
+def peak_rss_kb():
+    if resource is None:
+        return None
+    # ru_maxrss is a high-water mark in KB on Linux; parsing runs in pool workers, so include children
+    return max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+
+def higher_rss(a, b):
+    return b if a is None else a if b is None else max(a, b)
+
+class Profiler:
+    """Stage and function timings for one process.
+
+    Stages and counted functions share one call stack per thread, so the
+    self time of every stack path can be exported as a flamegraph.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.reset()
+        # A forked pool worker starts from a clean slate rather than the parent's open stages
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self.forked)
+
+    def forked(self):
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.stages = defaultdict(lambda: {'seconds': 0.0, 'calls': 0, 'rows': 0, 'peak_rss_kb': None})
+        self.files = defaultdict(lambda: {'seconds': 0.0, 'rows': 0})
+        self.functions = defaultdict(lambda: {'seconds': 0.0, 'calls': 0})
+        self.folded = defaultdict(float)
+
+    @property
+    def stack(self):
+        if not hasattr(self.local, 'stack'):
+            self.local.stack = []
+        return self.local.stack
+
+    def push(self, name):
+        # Frame: [name, start, time spent in children]
+        self.stack.append([name, time.perf_counter(), 0.0])
+
+    def pop(self):
+        stack = self.stack
+        _, start, child = stack[-1]
+        elapsed = time.perf_counter() - start
+        path = ';'.join(frame[0] for frame in stack)
+        stack.pop()
+        if stack:
+            stack[-1][2] += elapsed
+        with self.lock:
+            self.folded[path] += elapsed - child
+        return elapsed
+
+    def snapshot(self):
+        return {
+            'stages': dict(self.stages),
+            'files': dict(self.files),
+            'functions': dict(self.functions),
+            'folded': dict(self.folded),
+        }
+
+    def take(self):
+        """Return everything recorded so far and start over, for shipping results out of a worker."""
+        with self.lock:
+            snapshot = self.snapshot()
+            self.reset()
+        return snapshot
+
+    def merge(self, snapshot):
+        """Fold a worker's snapshot in under the stage that is currently open."""
+        prefix = ';'.join(f[0] for f in self.stack)
+        with self.lock:
+            for name, stage in snapshot['stages'].items():
+                target = self.stages[name]
+                for key in ('seconds', 'calls', 'rows'):
+                    target[key] += stage[key]
+                target['peak_rss_kb'] = higher_rss(target['peak_rss_kb'], stage['peak_rss_kb'])
+            for path, record in snapshot['files'].items():
+                for key in ('seconds', 'rows'):
+                    self.files[path][key] += record[key]
+            for name, record in snapshot['functions'].items():
+                for key in ('seconds', 'calls'):
+                    self.functions[name][key] += record[key]
+            for path, seconds in snapshot['folded'].items():
+                self.folded[f'{prefix};{path}' if prefix else path] += seconds
+
+    def report(self):
+        def with_rate(record):
+            rows, seconds = record.get('rows'), record['seconds']
+            return {**{k: round(v, 6) if isinstance(v, float) else v for k, v in record.items()},
+                    'rows_per_second': round(rows / seconds, 1) if rows and seconds else None}
+        return {
+            'wall_seconds': round(time.perf_counter() - self.started, 6),
+            'peak_rss_kb': peak_rss_kb(),
+            'stages': {name: with_rate(s) for name, s in self.stages.items()},
+            'files': {path: with_rate(f) for path, f in sorted(self.files.items())},
+            'functions': {name: with_rate(f) for name, f in
+                          sorted(self.functions.items(), key=lambda item: item[1]['seconds'], reverse=True)},
+        }
+
+    def write_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=4)
+
+    def write_folded(self, path):
+        """One 'frame;frame;frame microseconds' line per stack, as flamegraph.pl expects."""
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, seconds in sorted(self.folded.items()):
+                micros = round(seconds * 1e6)
+                if micros > 0:
+                    f.write(f'{stack} {micros}\n')
+
+    def write(self, path):
+        if path.endswith(('.folded', '.txt')):
+            self.write_folded(path)
+        else:
+            self.write_json(path)
+
+profiler = Profiler()
+
+class Stage:
+    """Context manager timing one pipeline stage; set .rows inside it to get a throughput figure."""
+
+    __slots__ = ('name', 'path', 'rows')
+
+    def __init__(self, name, path=None):
+        self.name = name
+        self.path = path
+        self.rows = 0
+
+    def __enter__(self):
+        profiler.push(self.name)
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = profiler.pop()
+        with profiler.lock:
+            stage = profiler.stages[self.name]
+            stage['seconds'] += elapsed
+            stage['calls'] += 1
+            stage['rows'] += self.rows
+            stage['peak_rss_kb'] = higher_rss(stage['peak_rss_kb'], peak_rss_kb())
+            if self.path is not None:
+                record = profiler.files[self.path]
+                record['seconds'] += elapsed
+                record['rows'] += self.rows
+        return False
+
+class NullStage:
+    __slots__ = ('rows',)
+
+    def __init__(self):
+        self.rows = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+def stage(name, path=None):
+    """Time a block as a named stage, and as a per-file timing when path is given."""
+    return Stage(name, path) if ENABLED else NullStage()
+
+def counted(func):
+    """Count calls and time spent in a hot function. Returns func untouched unless profiling is on."""
+    if not ENABLED:
+        return func
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profiler.push(name)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = profiler.pop()
+            with profiler.lock:
+                record = profiler.functions[name]
+                record['seconds'] += elapsed
+                record['calls'] += 1
+    return wrapper
+
+def take():
+    return profiler.take() if ENABLED else None
+
+def merge(snapshot):
+    if ENABLED and snapshot:
+        profiler.merge(snapshot)
+
+_owner = os.getpid()
+
+@atexit.register
+def _write_on_exit():
+    # Forked pool workers inherit this module; only the process that imported it first reports
+    if ENABLED and os.getpid() == _owner:
+        profiler.write(PROFILE_PATH)
+        print(f"Profile written to {PROFILE_PATH}")
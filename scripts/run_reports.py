@@ -0,0 +1,30 @@
+import sys
+
+import profiling
+from check_team_mappings import check_team_mappings
+from compile_league_stats import compile_league_stats
+from league_data import load_league
+from league_store import open_league
+from playoff_records import compile_league_stats as compile_playoff_stats, write_playoff_stats
+
+def run_reports(csv_root='csv', map_path='team_user_map.json', output_root='csv/all_time', store=None):
+    """Load every season once, from the CSVs or a compiled store, and run all of the reports against it."""
+    with profiling.stage('load'):
+        league = open_league(store) if store else load_league(csv_root, map_path)
+    with profiling.stage('check_mappings'):
+        check_team_mappings(league=league)
+    with profiling.stage('records'):
+        compile_league_stats(output_csv=f'{output_root}/records.csv', league=league)
+    with profiling.stage('playoffs'):
+        write_playoff_stats(compile_playoff_stats(league=league), f'{output_root}/playoff_records.csv')
+    print(f"Playoff stats written to {output_root}/playoff_records.csv")
+    return league
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    store = None
+    if '--store' in args:
+        i = args.index('--store')
+        store = args[i + 1] if i + 1 < len(args) else 'league.db'
+        del args[i:i + 2]
+    run_reports(*args[:3], store=store)
@@ -0,0 +1,271 @@
+import argparse
+import json
+import os
+import random
+from html import escape
+
+POSITIONS = ['QB', 'RB', 'RB', 'WR', 'WR', 'WR', 'TE', 'K', 'DEF']
+NFL_TEAMS = ['ARI', 'ATL', 'BAL', 'BUF', 'CAR', 'CHI', 'CIN', 'CLE', 'DAL', 'DEN', 'DET', 'GB',
+             'HOU', 'IND', 'JAX', 'KC', 'LAC', 'LAR', 'LV', 'MIA', 'MIN', 'NE', 'NO', 'NYG',
+             'NYJ', 'PHI', 'PIT', 'SEA', 'SF', 'TB', 'TEN', 'WAS']
+
+PLUS_ICON = ('<svg class="w-3 h-3" fill="currentColor" viewBox="0 0 24 24" xmlns="http://www.w3.org/2000/svg">'
+             '<path fill-rule="evenodd" d="M12 3.75a.75.75 0 0 1 .75.75v6.75h6.75a.75.75 0 0 1 0 1.5h-6.75v6.75a.75.75 0 0 1-1.5 0'
+             'v-6.75H4.5a.75.75 0 0 1 0-1.5h6.75V4.5a.75.75 0 0 1 .75-.75Z" clip-rule="evenodd"></path></svg>')
+MINUS_ICON = ('<svg class="w-3 h-3" fill="currentColor" viewBox="0 0 24 24" xmlns="http://www.w3.org/2000/svg">'
+              '<path fill-rule="evenodd" d="M4.25 12a.75.75 0 0 1 .75-.75h14a.75.75 0 0 1 0 1.5H5a.75.75 0 0 1-.75-.75Z" '
+              'clip-rule="evenodd"></path></svg>')
+MANAGE_CELL = ('<td class="whitespace-nowrap px-3 cursor-pointer py-1 text-center"><div class="relative inline-block text-center justify-center">'
+               '<div><button type="button" class="flex items-center rounded-full bg-gray-100 border border-gray-300 text-gray-400 '
+               'hover:bg-blue-100 hover:text-blue-600" id="menu-button"><span class="sr-only">Open options</span>'
+               '<svg class="h-5 w-5" viewBox="0 0 20 20" fill="currentColor" aria-hidden="true" xmlns="http://www.w3.org/2000/svg">'
+               '<path d="M10 3a1.5 1.5 0 110 3 1.5 1.5 0 010-3zM10 8.5a1.5 1.5 0 110 3 1.5 1.5 0 010-3zM11.5 15.5a1.5 1.5 0 10-3 0 '
+               '1.5 1.5 0 003 0z"></path></svg></button></div><!----></div></td>')
+TRADE_ICON = ('<svg class="w-4 h-4" fill="none" stroke="currentColor" stroke-width="2" viewBox="0 0 24 24" '
+              'xmlns="http://www.w3.org/2000/svg"><path stroke-linecap="round" stroke-linejoin="round" '
+              'd="M7.5 21 3 16.5m0 0L7.5 12M3 16.5h13.5m0-13.5L21 7.5m0 0L16.5 12M21 7.5H7.5"></path></svg>')
+
+# Longer team names are cut to this many characters, '...' included, everywhere but the teams page
+DISPLAY_LENGTH = 25
+# Share of transactions that are trades, and of team names long enough to be cut
+TRADE_SHARE = 0.1
+LONG_NAME_SHARE = 0.2
+
+def page(headers, rows):
+    """Wrap table rows in a page shaped like the league site's exports."""
+    head = ''.join(f'<th scope="col" class="py-3 pl-4 pr-3 text-left">{escape(h)}</th>' for h in headers)
+    return ('<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>League</title></head><body>'
+            '<div class="mt-4 overflow-x-auto"><table class="min-w-full divide-y divide-gray-300 bg-white">'
+            f'<thead class="bg-gray-700"><tr class="text-xs font-medium uppercase tracking-wide text-gray-200">{head}</tr></thead>'
+            f'<tbody class="divide-y divide-gray-200">{"".join(rows)}</tbody></table></div></body></html>')
+
+def cell(content, classes='whitespace-nowrap px-1 py-1'):
+    return f'<td class="{classes}">{content}</td>'
+
+def display_name(team):
+    """A team name as the matchup, draft and transaction pages show it, e.g. 'In Godwin We (no longe...'."""
+    return team if len(team) <= DISPLAY_LENGTH else team[:DISPLAY_LENGTH - 3] + '...'
+
+def team_block(team):
+    return ('<div class="flex items-center"><img src="https://www.gravatar.com/avatar/0?d=wavatar&amp;s=48" '
+            'class="rounded-full object-cover shadow border border-gray-300 h-5 w-5 mr-1">'
+            f'<div class="flex flex-col"><span class="text-xs">{escape(display_name(team))}<!----></span><!----></div></div>')
+
+def team_cell(team):
+    return cell(team_block(team))
+
+def trade_team_cell(team, partner):
+    """The transactions page cell for a trade: both teams stacked in one column."""
+    return cell(f'<div class="items-start justify-center flex flex-col">{team_block(team)}<span>{team_block(partner)}</span></div>',
+                'px-1 py-1')
+
+def trade_type_cell():
+    """The transactions page shows a trade only as this icon in Type."""
+    return cell(f'<!----><div class="rounded-full text-center font-bold p-1 bg-amber-500 text-white max-w-fit">{TRADE_ICON}</div>'
+                '<!----><!---->', 'px-1 py-1')
+
+def member_cell(team, username):
+    """The teams page cell: team name with the username beneath it, as one column."""
+    return cell('<div class="flex items-center"><img src="https://www.gravatar.com/avatar/0?d=wavatar&amp;s=48" '
+                'class="rounded-full object-cover shadow border border-gray-300 h-8 w-8 mr-2">'
+                f'<div class="flex flex-col"><span class="">{escape(team)}<!----></span>'
+                f'<span class="text-xs text-gray-400">{escape(username)}</span><!----></div></div>',
+                'whitespace-nowrap px-1 pl-2 py-1 flex flex-col')
+
+def misc_cell(text=''):
+    if not text:
+        return cell('<div class="flex justify-start gap-x-1"><!----><!----></div>')
+    return cell('<div class="inline-block text-xs cursor-pointer text-gray-200"><div><svg class="w-4 h-4 text-gray-700" '
+                'fill="none" stroke="currentColor" viewBox="0 0 24 24"><path d="m9 9 6-6m0 0 6 6m-6-6v12a6 6 0 0 1-12 0v-3"></path>'
+                f'</svg></div><div class="popper" style="display: none;"><div>{escape(text)}</div><!----></div></div>',
+                'whitespace-nowrap px-1 py-1 font-extrabold flex gap-x-2')
+
+def player_move(marker_class, icon, player):
+    return ('<div><div class="flex items-center justify-start"><div class="mr-2">'
+            f'<div class="rounded-full text-center font-bold p-0.5 {marker_class}">{icon}</div><!----></div>'
+            f'<div><span><div>{escape(player)}</div></span></div></div></div>')
+
+class SyntheticLeague:
+    """One league's users, team names, player pool and season results."""
+
+    def __init__(self, league_id, teams, seed):
+        self.rng = random.Random(seed)
+        self.league_id = league_id
+        self.users = [f'L{league_id}.User{i:02d}' for i in range(teams)]
+        self.usernames = {user: f'espn{self.rng.randrange(10**7, 10**8)}' for user in self.users}
+        self.strength = {user: self.rng.gauss(120, 12) for user in self.users}
+        self.team_names = {user: [] for user in self.users}
+        # (name, position, NFL team); the draft and transaction pages label them differently
+        self.players = [
+            (f'Player{league_id}x{i}', self.rng.choice(POSITIONS), self.rng.choice(NFL_TEAMS))
+            for i in range(max(300, teams * 30))
+        ]
+
+    def season_teams(self, year):
+        """Pick each user's team name for the season, sometimes reusing last year's."""
+        teams = {}
+        for user in self.users:
+            names = self.team_names[user]
+            if not names or self.rng.random() < 0.3:
+                if self.rng.random() < LONG_NAME_SHARE:
+                    names.append(f'{user.split(".")[1]} Memorial Fantasy Squad {year}')
+                else:
+                    names.append(f'{user.split(".")[1]} Squad {year}')
+            teams[user] = names[-1]
+        return teams
+
+    def team_user_map(self):
+        return [{'user': user, 'teams': names} for user, names in self.team_names.items()]
+
+def draft_label(player):
+    name, position, nfl_team = player
+    return f'{name} · {position} · ({nfl_team}) '
+
+def move_label(player):
+    name, position, nfl_team = player
+    return f'{name} · {nfl_team} · {position}'
+
+def play(league, home, away):
+    return round(max(40.0, league.rng.gauss(league.strength[home], 25)), 2), \
+        round(max(40.0, league.rng.gauss(league.strength[away], 25)), 2)
+
+def season_pages(league, year, weeks, rounds, moves_per_week):
+    """Build the teams, matchups, draft and transactions pages for one season."""
+    rng = league.rng
+    teams = league.season_teams(year)
+    users = list(league.users)
+    record = {user: [0, 0, 0, 0.0, 0.0] for user in users}
+    matchups = []
+
+    def add_game(week, home, away, game_type=''):
+        home_score, away_score = play(league, home, away)
+        matchups.append((week, home, home_score, away, away_score, game_type))
+        return home_score, away_score
+
+    # Round-robin regular season
+    order = users[:]
+    rng.shuffle(order)
+    for week in range(1, weeks + 1):
+        for i in range(len(order) // 2):
+            home, away = order[i], order[-1 - i]
+            home_score, away_score = add_game(week, home, away)
+            for user, pf, pa in ((home, home_score, away_score), (away, away_score, home_score)):
+                record[user][0 if pf > pa else 1 if pf < pa else 2] += 1
+                record[user][3] += pf
+                record[user][4] += pa
+        order.insert(1, order.pop())
+
+    # Top four play a two-week bracket, everyone else plays consolation games
+    standings = sorted(users, key=lambda u: (record[u][0], record[u][3]), reverse=True)
+    seeds, rest = standings[:4], standings[4:]
+    semi_winners = []
+    for home, away in ((seeds[0], seeds[3]), (seeds[1], seeds[2])):
+        home_score, away_score = add_game(weeks + 1, home, away, 'Playoff Game')
+        semi_winners.append(home if home_score >= away_score else away)
+    for playoff_week in (weeks + 1, weeks + 2):
+        for i in range(0, len(rest) - 1, 2):
+            add_game(playoff_week, rest[i], rest[i + 1], 'Consolation Game')
+    home_score, away_score = add_game(weeks + 2, semi_winners[0], semi_winners[1], 'Championship Game')
+    champion = semi_winners[0] if home_score >= away_score else semi_winners[1]
+    final_order = [champion] + [u for u in standings if u != champion]
+
+    team_rows = []
+    for rank, user in enumerate(standings, 1):
+        wins, losses, ties, pf, pa = record[user]
+        result = f'{wins}-{losses}' + (f'-{ties}' if ties else '')
+        team_rows.append('<tr class="text-xs text-gray-600">' + member_cell(teams[user], league.usernames[user])
+                         + cell('---') + cell(result) + cell(f'{pf:,.2f}') + cell(f'{pa:,.2f}')
+                         + cell(str(rank)) + cell(str(final_order.index(user) + 1)) + misc_cell() + MANAGE_CELL + '</tr>')
+
+    matchup_rows = [
+        '<tr class="text-xs text-gray-600">' + cell(f'Week {week}') + team_cell(teams[home])
+        + cell(f'<span>{home_score:.2f}</span>') + team_cell(teams[away]) + cell(f'<span>{away_score:.2f}</span>')
+        + misc_cell(game_type) + MANAGE_CELL + '</tr>'
+        for week, home, home_score, away, away_score, game_type in reversed(matchups)
+    ]
+
+    draft_rows = []
+    pool = rng.sample(league.players, min(len(league.players), rounds * len(users)))
+    for overall, player in enumerate(pool, 1):
+        round_number, pick = divmod(overall - 1, len(users))
+        drafter = users[pick] if round_number % 2 == 0 else users[-1 - pick]
+        draft_rows.append('<tr class="text-sm text-gray-600">' + cell(f'{round_number + 1}.{pick + 1} ({overall})')
+                          + cell(f'<div>{escape(draft_label(player))}</div>', 'whitespace-nowrap px-1 py-1 text-xs') + team_cell(teams[drafter])
+                          + cell('<span>--</span>') + cell('<span>--</span>') + misc_cell() + MANAGE_CELL + '</tr>')
+
+    transaction_rows = []
+    for week in range(weeks + 2, 0, -1):
+        for _ in range(rng.randint(0, moves_per_week * 2)):
+            if rng.random() < TRADE_SHARE:
+                team, partner = rng.sample(users, 2)
+                moves = ''.join(player_move(*rng.choice([('bg-green-300 text-green-800', PLUS_ICON),
+                                                          ('bg-red-300 text-red-800', MINUS_ICON)]), move_label(player))
+                                for player in rng.sample(league.players, rng.randint(1, 3)))
+                transaction_rows.append(
+                    '<tr class="text-xs text-gray-600">' + cell(f'Week {week}') + trade_type_cell()
+                    + trade_team_cell(teams[team], teams[partner])
+                    + cell(moves, 'whitespace-nowrap px-1 py-1 flex flex-col items-start justify-center gap-y-1')
+                    + cell('$0') + misc_cell() + MANAGE_CELL + '</tr>')
+                continue
+            added, dropped = rng.sample(league.players, 2)
+            moves = player_move('bg-green-300 text-green-800', PLUS_ICON, move_label(added))
+            if rng.random() < 0.8:
+                moves += player_move('bg-red-300 text-red-800', MINUS_ICON, move_label(dropped))
+            transaction_rows.append(
+                '<tr class="text-xs text-gray-600">' + cell(f'Week {week}') + cell('') + team_cell(teams[rng.choice(users)])
+                + cell(moves, 'whitespace-nowrap px-1 py-1 flex flex-col items-start justify-center gap-y-1')
+                + cell(f'${rng.choice([0, 0, 0, 1, 5, 12])}') + misc_cell() + MANAGE_CELL + '</tr>')
+
+    return {
+        # Username shares the Team/Member cell, as on the real export; the importer splits it out
+        'teams': page(['Team/Member', 'Rival', 'Record', 'Points Scored', 'Points Against',
+                       'Inseason Rank', 'Final Rank', 'Misc', 'Manage'], team_rows),
+        'matchups': page(['Week', 'Team', 'Score', 'Opponent', 'Score', 'Misc', 'Manage'], matchup_rows),
+        'draft': page(['Pick', 'Player', 'Team', 'Keeper', 'Note', 'Misc', 'Manage'], draft_rows),
+        'transactions': page(['Transaction At', 'Type', 'Team', 'Transaction', 'FAAB', 'Misc', 'Manage'], transaction_rows),
+    }
+
+def generate_leagues(output_root='synthetic', leagues=1, seasons=8, teams=10, weeks=14,
+                     rounds=16, moves_per_week=8, first_season=2017, seed=0):
+    """Write input/<year>-<kind>.html pages and a team_user_map.json for each synthetic league.
+
+    Each league goes to output_root/league_<n>/ so it can be imported and
+    reported on exactly like the real league. Returns the league roots.
+    """
+    if teams < 4 or teams % 2:
+        raise ValueError("teams must be an even number of at least 4")
+    roots = []
+    for league_id in range(leagues):
+        league = SyntheticLeague(league_id, teams, seed * 100003 + league_id)
+        root = os.path.join(output_root, f'league_{league_id}')
+        input_root = os.path.join(root, 'input')
+        os.makedirs(input_root, exist_ok=True)
+        for year in range(first_season, first_season + seasons):
+            for kind, html in season_pages(league, year, weeks, rounds, moves_per_week).items():
+                with open(os.path.join(input_root, f'{year}-{kind}.html'), 'w', encoding='utf-8') as f:
+                    f.write(html)
+        with open(os.path.join(root, 'team_user_map.json'), 'w', encoding='utf-8') as f:
+            json.dump(league.team_user_map(), f, indent=4)
+        roots.append(root)
+    return roots
+
+def add_scale_arguments(parser):
+    parser.add_argument('--leagues', type=int, default=1)
+    parser.add_argument('--seasons', type=int, default=8)
+    parser.add_argument('--teams', type=int, default=10)
+    parser.add_argument('--weeks', type=int, default=14)
+    parser.add_argument('--rounds', type=int, default=16)
+    parser.add_argument('--moves-per-week', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=0)
+
+def scale_options(args):
+    return {'leagues': args.leagues, 'seasons': args.seasons, 'teams': args.teams, 'weeks': args.weeks,
+            'rounds': args.rounds, 'moves_per_week': args.moves_per_week, 'seed': args.seed}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate synthetic league exports.')
+    parser.add_argument('output_root', nargs='?', default='synthetic')
+    add_scale_arguments(parser)
+    args = parser.parse_args()
+    roots = generate_leagues(args.output_root, **scale_options(args))
+    print(f"Generated {len(roots)} leagues under {args.output_root}")
@@ -0,0 +1,63 @@
+import json
+from bisect import bisect_left
+
+import profiling
+
+def load_team_user_map(map_path='team_user_map.json'):
+    with open(map_path, encoding='utf-8') as f:
+        mapping = json.load(f)
+    team_to_user = {}
+    for entry in mapping:
+        user = entry['user']
+        for team in entry['teams']:
+            team_to_user[team] = user
+    return team_to_user
+
+class TeamResolver:
+    """Resolve team names, including ellipsis-truncated ones, to users.
+
+    A name that is itself a mapped team always resolves to that team. Only
+    names truncated with '...' fall back to prefix matching, for which team
+    names are kept in a sorted array so every name starting with a given
+    prefix is one bisect away. Resolutions are cached, and truncated names
+    that match teams belonging to more than one user are recorded in
+    `ambiguous`.
+    """
+
+    def __init__(self, team_to_user):
+        self.team_to_user = team_to_user
+        self._teams = sorted(team_to_user)
+        # Position of each team in the map, so ties resolve like a linear scan would
+        order = {team: i for i, team in enumerate(team_to_user)}
+        self._order = [order[team] for team in self._teams]
+        self._cache = {}
+        self.ambiguous = {}
+
+    @profiling.counted
+    def resolve(self, team):
+        """Return the user for a team name, or None if no mapped team matches."""
+        if team in self.team_to_user:
+            return self.team_to_user[team]
+        if "..." not in team:
+            return None
+        if team in self._cache:
+            return self._cache[team]
+        prefix = team.replace("...", "")
+        best = None
+        users = set()
+        i = bisect_left(self._teams, prefix)
+        while i < len(self._teams) and self._teams[i].startswith(prefix):
+            users.add(self.team_to_user[self._teams[i]])
+            if best is None or self._order[i] < self._order[best]:
+                best = i
+            i += 1
+        if len(users) > 1:
+            self.ambiguous[team] = sorted(users)
+        user = self.team_to_user[self._teams[best]] if best is not None else None
+        self._cache[team] = user
+        return user
+
+    __call__ = resolve
+
+def load_team_resolver(map_path='team_user_map.json'):
+    return TeamResolver(load_team_user_map(map_path))
@@ -0,0 +1,172 @@
+import argparse
+import csv
+import gzip
+import heapq
+import os
+from itertools import count
+
+from league_data import find_column, load_league, parse_float, parse_week
+
+# Same layout as the hand-kept csv/all_time/top_player_perf.csv, which other scripts read
+OUTPUT_HEADER = ['RANK', 'SEAON', 'NAME', 'TEAM_NAME', 'LEAGUEMATE', 'PPR', 'WEEK',
+                 'AGAINST_TEAM', 'AGAINST_LEAGUEMATE', 'DATE', 'TM']
+
+class Performance:
+    __slots__ = ('season', 'week', 'player', 'team', 'user', 'points',
+                 'opponent', 'opponent_user', 'date', 'nfl_team')
+
+    def __init__(self, season, week, player, team, user, points, opponent, opponent_user, date, nfl_team):
+        self.season = season
+        self.week = week
+        self.player = player
+        self.team = team
+        self.user = user
+        self.points = points
+        self.opponent = opponent
+        self.opponent_user = opponent_user
+        self.date = date
+        self.nfl_team = nfl_team
+
+class TopK:
+    """The k highest scoring performances seen so far, kept in a size-k min-heap.
+
+    A performance that does not beat the current k-th best is rejected with
+    one comparison, so a long stream costs O(n log k) and O(k) memory. Ties
+    keep whichever performance was seen first.
+    """
+
+    __slots__ = ('k', 'heap')
+
+    def __init__(self, k):
+        self.k = k
+        self.heap = []
+
+    def push(self, points, seq, perf):
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, (points, -seq, perf))
+        elif points > self.heap[0][0]:
+            heapq.heapreplace(self.heap, (points, -seq, perf))
+
+    def ranked(self):
+        return [perf for _, _, perf in sorted(self.heap, key=lambda item: (-item[0], -item[1]))]
+
+class Leaderboards:
+    """All-time, per-season and per-user top-K boards fed from one pass over the stream."""
+
+    def __init__(self, k=25):
+        self.k = k
+        self.all_time = TopK(k)
+        self.by_season = {}
+        self.by_user = {}
+        self.seen = 0
+        self._seq = count()
+
+    def add(self, perf):
+        seq = next(self._seq)
+        self.seen += 1
+        self.all_time.push(perf.points, seq, perf)
+        if perf.season not in self.by_season:
+            self.by_season[perf.season] = TopK(self.k)
+        self.by_season[perf.season].push(perf.points, seq, perf)
+        if perf.user:
+            if perf.user not in self.by_user:
+                self.by_user[perf.user] = TopK(self.k)
+            self.by_user[perf.user].push(perf.points, seq, perf)
+
+def open_stats(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', newline='', encoding='utf-8')
+    return open(path, newline='', encoding='utf-8')
+
+def opponent_index(league):
+    """Map (season, week, user) to the (team, user) they played that week."""
+    index = {}
+    for m in league.matchups():
+        if m.team_user and m.opponent_user:
+            index.setdefault((m.season, m.week, m.team_user), (m.opponent, m.opponent_user))
+            index.setdefault((m.season, m.week, m.opponent_user), (m.team, m.team_user))
+    return index
+
+def stream_performances(stat_csv, resolve_user, opponents):
+    """Yield a Performance per row of a weekly player scoring file, without holding the file in memory.
+
+    Columns are found by name: season, week, player (or name), team, and
+    points (or ppr); date, nfl team and an opponent team are used if present.
+    The opponent comes from that week's matchup when the owner resolves.
+    """
+    with open_stats(stat_csv) as f:
+        reader = csv.DictReader(f)
+        fields = reader.fieldnames
+        season_col = find_column(fields, exact=['season', 'seaon', 'year'])
+        week_col = find_column(fields, exact=['week'])
+        player_col = find_column(fields, exact=['player', 'name', 'player_name'])
+        team_col = find_column(fields, exact=['team', 'team_name', 'fantasy_team'])
+        points_col = find_column(fields, exact=['ppr', 'points', 'fpts', 'fantasy_points'])
+        missing = [name for name, col in (('season', season_col), ('week', week_col), ('player', player_col),
+                                          ('team', team_col), ('points', points_col)) if col is None]
+        if missing:
+            raise ValueError(f"{stat_csv} has no {', '.join(missing)} column")
+        date_col = find_column(fields, exact=['date'])
+        nfl_col = find_column(fields, exact=['tm', 'nfl_team'])
+        against_col = find_column(fields, exact=['against_team', 'opponent'])
+
+        for row in reader:
+            season = row[season_col].strip()
+            week = parse_week(row[week_col])
+            team = row[team_col].strip()
+            user = resolve_user(team)
+            opponent, opponent_user = opponents.get((season, week, user), (None, None))
+            if opponent is None and against_col:
+                opponent = row[against_col].strip()
+                opponent_user = resolve_user(opponent) if opponent else None
+            yield Performance(season, week, row[player_col].strip(), team, user, parse_float(row[points_col]),
+                              opponent or '', opponent_user, row[date_col] if date_col else '',
+                              row[nfl_col] if nfl_col else '')
+
+def write_board(performances, f, group=None):
+    writer = csv.writer(f)
+    prefix = [group] if group is not None else []
+    for rank, perf in enumerate(performances, 1):
+        writer.writerow(prefix + [rank, perf.season, perf.player, perf.team, perf.user or '', f'{perf.points:g}',
+                                  perf.week, perf.opponent, perf.opponent_user or '', perf.date, perf.nfl_team])
+
+def write_leaderboards(boards, output_root='csv/all_time'):
+    """Write top_player_perf.csv plus the per-season and per-user boards next to it."""
+    paths = {
+        'all_time': os.path.join(output_root, 'top_player_perf.csv'),
+        'season': os.path.join(output_root, 'top_player_perf_by_season.csv'),
+        'user': os.path.join(output_root, 'top_player_perf_by_user.csv'),
+    }
+    with open(paths['all_time'], 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerow(OUTPUT_HEADER)
+        write_board(boards.all_time.ranked(), f)
+    with open(paths['season'], 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerow(['GROUP_SEASON'] + OUTPUT_HEADER)
+        for season in sorted(boards.by_season):
+            write_board(boards.by_season[season].ranked(), f, season)
+    with open(paths['user'], 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerow(['GROUP_LEAGUEMATE'] + OUTPUT_HEADER)
+        for user in sorted(boards.by_user):
+            write_board(boards.by_user[user].ranked(), f, user)
+    return paths
+
+def build_top_performances(stat_csv, csv_root='csv', map_path='team_user_map.json', k=25,
+                           output_root='csv/all_time', league=None):
+    if league is None:
+        league = load_league(csv_root, map_path, kinds=['matchups'])
+    boards = Leaderboards(k)
+    for perf in stream_performances(stat_csv, league.resolve_user, opponent_index(league)):
+        boards.add(perf)
+    paths = write_leaderboards(boards, output_root)
+    print(f"Top {k} performances from {boards.seen:,} player-weeks written to {paths['all_time']}")
+    return boards
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build top player performance leaderboards from weekly scoring.')
+    parser.add_argument('stats', help='weekly player scoring CSV (optionally .gz)')
+    parser.add_argument('-k', type=int, default=25, help='performances kept per board')
+    parser.add_argument('--csv-root', default='csv')
+    parser.add_argument('--map', default='team_user_map.json')
+    parser.add_argument('--output-root', default='csv/all_time')
+    args = parser.parse_args()
+    build_top_performances(args.stats, args.csv_root, args.map, args.k, args.output_root)
@@ -0,0 +1,114 @@
+import re
+import sys
+from collections import defaultdict
+
+from league_data import load_league
+
+# '(+) Gerald Everett   CHI   TE, (-) Matt Breida SF RB' -> one move per marker
+MOVE_SPLIT = re.compile(r',\s*(?=\([+-]\))')
+MOVE_KINDS = {'(+)': 'add', '(-)': 'drop'}
+
+class TransactionEvent:
+    __slots__ = ('season', 'week', 'kind', 'player', 'nfl_team', 'position', 'team', 'user', 'faab',
+                 'partner', 'partner_user')
+
+    def __init__(self, season, week, kind, player, nfl_team, position, team, user, faab,
+                 partner='', partner_user=None):
+        self.season = season
+        self.week = week
+        self.kind = kind
+        self.player = player
+        self.nfl_team = nfl_team
+        self.position = position
+        self.team = team
+        self.user = user
+        self.faab = faab
+        self.partner = partner
+        self.partner_user = partner_user
+
+def player_key(name):
+    """Normalise a player name for lookups: case and runs of whitespace are ignored."""
+    return ' '.join(name.split()).lower()
+
+def parse_move(text):
+    """Split one move like '(+) Gerald Everett   CHI   TE' into (kind, player, nfl team, position)."""
+    marker, _, rest = text.strip().partition(' ')
+    kind = MOVE_KINDS.get(marker)
+    parts = (rest if kind else text).split()
+    if len(parts) < 3:
+        return kind, ' '.join(parts), '', ''
+    return kind, ' '.join(parts[:-2]), parts[-2], parts[-1]
+
+def parse_transaction(transaction):
+    """Turn one transactions.csv row into add, drop or trade events.
+
+    The importer writes 'Trade' in Type for trades. The export does not say
+    which side each traded player went to, so every move in the row becomes
+    one trade event carrying both teams.
+    """
+    is_trade = 'trade' in transaction.type.lower()
+    events = []
+    for move in MOVE_SPLIT.split(transaction.transaction):
+        if not move.strip():
+            continue
+        kind, player, nfl_team, position = parse_move(move)
+        if is_trade:
+            kind = 'trade'
+        events.append(TransactionEvent(
+            transaction.season, transaction.week, kind or 'unknown', player, nfl_team, position,
+            transaction.team, transaction.user, transaction.faab if kind == 'add' else 0.0,
+            transaction.partner, transaction.partner_user,
+        ))
+    return events
+
+class TransactionIndex:
+    """Every transaction event with inverted indexes by player, user and (season, week)."""
+
+    def __init__(self, events):
+        self.events = events
+        self.by_player = defaultdict(list)
+        self.by_user = defaultdict(list)
+        self.by_week = defaultdict(list)
+        for event in events:
+            self.by_player[player_key(event.player)].append(event)
+            self.by_user[event.user].append(event)
+            # A trade belongs to both of its users
+            if event.partner_user is not None and event.partner_user != event.user:
+                self.by_user[event.partner_user].append(event)
+            self.by_week[(event.season, event.week)].append(event)
+
+    def for_player(self, name, kind=None):
+        events = self.by_player.get(player_key(name), [])
+        return [e for e in events if e.kind == kind] if kind else events
+
+    def for_user(self, user, kind=None):
+        events = self.by_user.get(user, [])
+        return [e for e in events if e.kind == kind] if kind else events
+
+    def for_week(self, season, week):
+        return self.by_week.get((str(season), week), [])
+
+def build_transaction_index(csv_root='csv', map_path='team_user_map.json', league=None):
+    if league is None:
+        league = load_league(csv_root, map_path, kinds=['transactions'])
+    return TransactionIndex([event for t in league.transactions() for event in parse_transaction(t)])
+
+def print_player_history(name, index=None):
+    index = index or build_transaction_index()
+    events = index.for_player(name)
+    if not events:
+        print(f"No transactions found for {name}")
+        return
+    print(f"{'Season':<6} | {'Week':>4} | {'Move':<5} | {'User':<14} | {'FAAB':>5} | Team")
+    print('-'*60)
+    for e in sorted(events, key=lambda e: (e.season, e.week or 0)):
+        print(f"{e.season:<6} | {e.week or '':>4} | {e.kind:<5} | {e.user or '(unknown)':<14} | {e.faab:>5.0f} | {e.team}")
+    adds = sum(1 for e in events if e.kind == 'add')
+    drops = sum(1 for e in events if e.kind == 'drop')
+    print(f"\n{events[0].player}: added {adds} times, dropped {drops} times")
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print("Usage: python3 scripts/transaction_index.py <player name>")
+        sys.exit(1)
+    print_player_history(' '.join(sys.argv[1:]))
@@ -0,0 +1,140 @@
+import argparse
+import glob
+import os
+import time
+
+from compile_league_stats import aggregate_team_seasons, write_league_stats
+from import_seasons import import_seasons
+from league_data import League, load_season
+from playoff_records import compile_league_stats as compile_playoff_stats, write_playoff_stats
+from team_map import load_team_resolver
+
+try:
+    from league_arrays import ColumnarLeague
+except ImportError:  # numpy is not installed, aggregate row by row
+    ColumnarLeague = None
+
+def snapshot(paths):
+    """Map each path to its (mtime, size) so changed files can be spotted without reading them."""
+    result = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        result[path] = (stat.st_mtime_ns, stat.st_size)
+    return result
+
+def changed_paths(before, after):
+    return {path for path in before.keys() | after.keys() if before.get(path) != after.get(path)}
+
+def merge_partials(partials):
+    """Add up per-season stats dicts in season order, keeping first-seen user order."""
+    merged = {}
+    for year in sorted(partials):
+        for user, stats in partials[year].items():
+            if user not in merged:
+                merged[user] = dict(stats)
+            else:
+                for key, value in stats.items():
+                    merged[user][key] += value
+    return merged
+
+def season_partials(csv_root, year, resolve_user):
+    """Regular-season and playoff stats for one season directory, ready for merge_partials."""
+    season = load_season(os.path.join(csv_root, year), year, resolve_user, kinds=['teams', 'matchups'])
+    league = League({year: season}, resolve_user)
+    if ColumnarLeague is not None:
+        columns = ColumnarLeague(league)
+        return columns.regular_season_stats(), columns.playoff_stats()
+    return aggregate_team_seasons(league), compile_playoff_stats(league=league)
+
+class SeasonWatcher:
+    """Keeps per-season regular-season and playoff partials and rebuilds only what changed.
+
+    Changed pages in input_root are only imported into csv_root when
+    import_pages is set; otherwise they are reported and csv_root is left as it is.
+    """
+
+    def __init__(self, input_root='input', csv_root='csv', map_path='team_user_map.json', output_root='csv/all_time',
+                 import_pages=False, manifest_path='import_manifest.json'):
+        self.input_root = input_root
+        self.csv_root = csv_root
+        self.map_path = map_path
+        self.output_root = output_root
+        self.import_pages = import_pages
+        self.manifest_path = manifest_path
+        self.inputs = {}
+        self.season_files = {}
+        self.map_state = None
+        self.records = {}
+        self.playoffs = {}
+
+    def season_paths(self):
+        return glob.glob(os.path.join(self.csv_root, '[0-9]*', '*.csv'))
+
+    def step(self):
+        """Run one pass: import changed pages if enabled, refresh changed seasons, rewrite the all-time files."""
+        inputs = snapshot(glob.glob(os.path.join(self.input_root, '*.html')))
+        changed_inputs = changed_paths(self.inputs, inputs)
+        first_pass = self.map_state is None
+        self.inputs = inputs
+        # The first pass only records the pages; csv/ is taken as already imported
+        if changed_inputs and not first_pass:
+            if self.import_pages:
+                import_seasons(self.input_root, self.csv_root, manifest_path=self.manifest_path, only=changed_inputs)
+            else:
+                print(f"Changed pages not imported (pass --import): {', '.join(sorted(changed_inputs))}")
+
+        map_state = snapshot([self.map_path])
+        season_files = snapshot(self.season_paths())
+        if map_state != self.map_state:
+            # Any team name may now resolve differently, so every season is stale
+            self.map_state = map_state
+            self.resolve_user = load_team_resolver(self.map_path)
+            changed_years = {os.path.basename(os.path.dirname(path)) for path in season_files}
+        else:
+            changed_years = {os.path.basename(os.path.dirname(path))
+                             for path in changed_paths(self.season_files, season_files)}
+        self.season_files = season_files
+        if not changed_years:
+            return set()
+
+        for year in sorted(changed_years):
+            if os.path.isdir(os.path.join(self.csv_root, year)):
+                self.records[year], self.playoffs[year] = season_partials(self.csv_root, year, self.resolve_user)
+            else:
+                self.records.pop(year, None)
+                self.playoffs.pop(year, None)
+
+        os.makedirs(self.output_root, exist_ok=True)
+        write_league_stats(merge_partials(self.records), os.path.join(self.output_root, 'records.csv'))
+        write_playoff_stats(merge_partials(self.playoffs), os.path.join(self.output_root, 'playoff_records.csv'))
+        print(f"Rebuilt seasons {', '.join(sorted(changed_years))}")
+        return changed_years
+
+    def watch(self, interval=2.0):
+        print(f"Watching {self.input_root}/ and {self.csv_root}/ every {interval}s (Ctrl-C to stop)")
+        try:
+            while True:
+                self.step()
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Rebuild changed seasons and the all-time records as files change.')
+    parser.add_argument('--input-root', default='input')
+    parser.add_argument('--csv-root', default='csv')
+    parser.add_argument('--map', default='team_user_map.json')
+    parser.add_argument('--output-root', default='csv/all_time')
+    parser.add_argument('--interval', type=float, default=2.0)
+    parser.add_argument('--once', action='store_true', help='run a single pass and exit')
+    parser.add_argument('--import', dest='import_pages', action='store_true',
+                        help='import changed pages from --input-root into --csv-root')
+    args = parser.parse_args()
+    watcher = SeasonWatcher(args.input_root, args.csv_root, args.map, args.output_root, args.import_pages)
+    if args.once:
+        watcher.step()
+    else:
+        watcher.watch(args.interval)